@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 
 from app.database.schemas import PersonalInfoBase
@@ -48,7 +48,9 @@ class CoverLetterRequest(BaseModel):
     template_path: Optional[str] = None
     
 class GenerateFullApplicationRequest(BaseModel):
-    job_description: dict
+    # Either a pre-analyzed dict (from /analyze-job) or the raw job text,
+    # which the route parses and writes in one combined Gemini call
+    job_description: Union[dict, str]
     personal_info_id: Optional[int] = None
     top_k: int = 4
     selected_projects: Optional[List[MatchedProject]] = None
@@ -5,7 +5,7 @@ import os
 from app.models.project import CVGenerationRequest, CoverLetterRequest, GenerateFullApplicationRequest
 from app.services.cv_generator import CVGenerator
 from app.services.letter_generator import CoverLetterGenerator
-from app.services.embeddings import EmbeddingService
+from app.services.embeddings import get_embedding_service
 from app.database.database import get_db
 from app.database import crud, schemas
 from app.database.schemas import PersonalInfoBase
@@ -135,7 +135,7 @@ async def generate_full_application(request: GenerateFullApplicationRequest, db:
                     1, 
                     5
                 )
-            embedding_service = EmbeddingService()
+            embedding_service = get_embedding_service()
             jd = request.job_description
             if isinstance(jd, dict):
                 job_description = ", ".join(str(v) for v in jd.values() if v)
@@ -168,13 +168,38 @@ async def generate_full_application(request: GenerateFullApplicationRequest, db:
         
         # Prepare job description for cover letter
         jd = request.job_description
+        letter_path = None
         if isinstance(jd, dict):
             job_description = ", ".join(str(v) for v in jd.values() if v)
             job_title = jd.get("title", "Unknown Position")
             company_name = jd.get("company", "Unknown Company")
             job_desc_text = jd.get("full_description", "")
             job_requirements = jd.get("requirements", "")
-        
+        else:
+            # Raw job text: one combined Gemini call parses the job and
+            # writes the cover letter, instead of separate analyze and
+            # letter round trips over the same text
+            if client_id:
+                await send_websocket_progress(
+                    client_id,
+                    "Analyzing job and generating cover letter...",
+                    "cover_letter_generation",
+                    2,
+                    5
+                )
+            job_description = str(jd)
+            letter_request = CoverLetterRequest(
+                job_description=job_description,
+                matched_projects=matched_projects,
+                personal_info=personal_info_data
+            )
+            letter_generator = CoverLetterGenerator()
+            letter_path, job_analysis = letter_generator.generate_cover_letter_with_analysis(letter_request)
+            job_title = job_analysis.get("title", "Unknown Position")
+            company_name = job_analysis.get("company", "Unknown Company")
+            job_desc_text = job_analysis.get("full_description", job_description)
+            job_requirements = job_analysis.get("requirements", "")
+
         # Step 2: Create job application record if personal_info_id is provided
         job_app_id = None
         if request.personal_info_id:
@@ -217,25 +242,27 @@ async def generate_full_application(request: GenerateFullApplicationRequest, db:
                 5
             )
         
-        # Step 4: Generate Cover Letter
-        if client_id:
-            await send_websocket_progress(
-                client_id, 
-                "Generating cover letter...", 
-                "cover_letter_generation", 
-                4, 
-                5
+        # Step 4: Generate Cover Letter (already produced by the combined
+        # parse-and-write call when the job description arrived as raw text)
+        if letter_path is None:
+            if client_id:
+                await send_websocket_progress(
+                    client_id,
+                    "Generating cover letter...",
+                    "cover_letter_generation",
+                    4,
+                    5
+                )
+
+            print("Generating cover letter...")
+            letter_request = CoverLetterRequest(
+                job_description=job_description,
+                matched_projects=matched_projects,
+                personal_info=personal_info_data
             )
-            
-        print("Generating cover letter...")
-        letter_request = CoverLetterRequest(
-            job_description=job_description,
-            matched_projects=matched_projects,
-            personal_info=personal_info_data
-        )
-        
-        letter_generator = CoverLetterGenerator()
-        letter_path = letter_generator.generate_cover_letter(letter_request)
+
+            letter_generator = CoverLetterGenerator()
+            letter_path = letter_generator.generate_cover_letter(letter_request)
         
         # Step 5: Update job application with file paths if we created one
         if job_app_id:
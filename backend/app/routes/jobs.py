@@ -2,9 +2,9 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import List, Optional
 from pydantic import BaseModel
 from app.models.project import JobDescription, MatchedProject
-from app.services.embeddings import EmbeddingService
+from app.services.embeddings import get_embedding_service
 from app.services.github_scraper import GitHubScraper
-from app.services.gemini_service import GeminiService
+from app.services.gemini_service import get_gemini_service
 import json
 from datetime import datetime
 
@@ -59,7 +59,7 @@ async def match_projects_to_job(job_description: JobDescriptionInput, top_k: int
                 1
             )
         
-        embedding_service = EmbeddingService()
+        embedding_service = get_embedding_service()
         jd = job_description.job_description
 
         # If it's a dict (structured JD), merge values into one string
@@ -173,7 +173,7 @@ async def analyze_job_description(job_description: JobDescription):
                 1
             )
         
-        gemini_service = GeminiService()
+        gemini_service = get_gemini_service()
         analysis = gemini_service.job_description_parser(job_description.description)
         
         if not analysis:
@@ -223,7 +223,7 @@ def refresh_embeddings():
             raise HTTPException(status_code=404, detail="No projects found. Please scrape GitHub repositories first.")
         
         # Only initialize embedding service if we have projects
-        embedding_service = EmbeddingService()
+        embedding_service = get_embedding_service()
         embedding_service.generate_embeddings_for_projects(projects)
         
         return {
@@ -257,7 +257,7 @@ def toggle_project_visibility(project_name: str, visibility_update: ProjectVisib
         # Refresh embeddings to exclude/include the project (only if there are visible projects)
         visible_projects = [p for p in projects if not getattr(p, 'hidden_from_search', False)]
         if visible_projects:
-            embedding_service = EmbeddingService()
+            embedding_service = get_embedding_service()
             embedding_service.generate_embeddings_for_projects(projects)
         
         return {
@@ -294,7 +294,7 @@ def update_project_content(project_name: str, content_update: ProjectContentUpda
         try:
             visible_projects = [p for p in projects if not getattr(p, 'hidden_from_search', False)]
             if visible_projects:
-                embedding_service = EmbeddingService()
+                embedding_service = get_embedding_service()
                 embedding_service.generate_embeddings_for_projects(projects)
                 embeddings_refreshed = True
         except Exception as e:
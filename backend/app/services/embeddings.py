@@ -1,12 +1,140 @@
+import hashlib
+import importlib.util
 import os
 import pickle
 import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import cached_property, lru_cache
 from typing import List, Dict
+import numpy as np
+import orjson
+import torch
 from sentence_transformers import SentenceTransformer
 import faiss
 from datetime import datetime, timezone
 from app.models.project import Project, MatchedProject
-from app.services.gemini_service import GeminiService
+from app.services.gemini_service import get_gemini_service
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def _score_candidates(sem, core, sec, rec, qual, readme_mult, dom_hit):
+    """Fused scoring kernel over all candidates.
+
+    Combines the weighted base score (semantic 0.35, tech overlap 0.4 split
+    80/20 core/secondary, recency 0.15, quality 0.1) with the README penalty
+    multiplier and a branch-free bonus for strong/moderate core-tech matches
+    and domain relevance. JIT-compiled with numba when available.
+    """
+    n = sem.shape[0]
+    out = np.empty(n, dtype=np.float32)
+    for i in prange(n):
+        base = (
+            0.35 * sem[i]
+            + 0.4 * (0.8 * core[i] + 0.2 * sec[i])
+            + 0.15 * rec[i]
+            + 0.1 * qual[i]
+        )
+        bonus = (
+            1.0
+            + 0.3 * (core[i] > 0.6)
+            + 0.15 * ((core[i] > 0.3) & (core[i] <= 0.6))
+            + 0.1 * dom_hit[i]
+        )
+        out[i] = base * readme_mult[i] * bonus
+    return out
+
+
+def _sorted_intersect_count(a, b):
+    """Count common elements of two sorted id arrays with a two-pointer merge."""
+    i = j = count = 0
+    while i < a.shape[0] and j < b.shape[0]:
+        if a[i] == b[j]:
+            count += 1
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return count
+
+
+if njit is not None:
+    _score_candidates = njit(parallel=True, fastmath=True, cache=True)(_score_candidates)
+    _sorted_intersect_count = njit(cache=True)(_sorted_intersect_count)
+
+
+# Recency ladder: <=30d -> 1.0, <=90d -> 0.9, <=180d -> 0.8,
+# <=365d -> 0.6, <=730d -> 0.4, older -> 0.2
+_RECENCY_DAY_BOUNDS = np.array([30, 90, 180, 365, 730])
+_RECENCY_SCORES = np.array([1.0, 0.9, 0.8, 0.6, 0.4, 0.2])
+
+# Markdown-stripping patterns for _clean_text, compiled once at import
+_MD_IMG = re.compile(r'!\[.*?\]\(.*?\)')
+_MD_LINK = re.compile(r'\[.*?\]\(.*?\)')
+_MD_CODE = re.compile(r'`{1,3}.*?`{1,3}', re.DOTALL)
+_MD_HEADER = re.compile(r'#{1,6}\s+')
+_MD_EMPHASIS = re.compile(r'\*{1,2}(.*?)\*{1,2}')
+
+# One SentenceTransformer per model name per process, shared across
+# EmbeddingService instances (the checkpoint is ~500MB and takes seconds
+# to load)
+_MODEL_CACHE: Dict[str, SentenceTransformer] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+# LRU cache of (job_info, normalized job embedding) keyed by a digest of
+# the raw job description, shared across instances so re-queries of the
+# same job (re-rank, cover letter) skip the extraction and the encoder
+_JOB_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_JOB_CACHE_MAX = 256
+
+
+class _VectorCache:
+    """sqlite-backed store of project embedding vectors keyed by content hash.
+
+    Re-running the pipeline re-embeds every project even though most
+    READMEs are unchanged between scrapes; with vectors keyed by a digest
+    of the embedding-relevant text, only projects whose content actually
+    changed hit the encoder.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(hash TEXT PRIMARY KEY, dim INTEGER, vec BLOB)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dim, vec FROM embeddings WHERE hash = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        dim, blob = row
+        return np.frombuffer(blob, dtype=np.float32, count=dim)
+
+    def set_many(self, items):
+        """Store an iterable of (key, float32 vector) pairs in one transaction"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                ((key, vec.shape[0], vec.astype(np.float32, copy=False).tobytes())
+                 for key, vec in items)
+            )
+            self._conn.commit()
+
 
 class EmbeddingService:
     def __init__(self):
@@ -14,14 +142,42 @@ class EmbeddingService:
         Initialize embedding service with enhanced matching capabilities
         """
         self.model_name = "sentence-transformers/all-mpnet-base-v2"  # Better general performance
-        self.model = SentenceTransformer(self.model_name)
+        # Route encoding to an accelerator when one is present; encoding on
+        # CPU is an order of magnitude slower for bulk project batches
+        if torch.cuda.is_available():
+            self.device = 'cuda'
+        elif torch.backends.mps.is_available():
+            self.device = 'mps'
+        else:
+            self.device = 'cpu'
+        # Tunable per backend: bigger batches help GPUs, smaller ones keep
+        # CPU latency reasonable
+        self.encode_batch_size = int(
+            os.getenv("EMBEDDING_BATCH_SIZE", 64 if self.device != 'cpu' else 16)
+        )
+        # Keep the FAISS index GPU-resident when the GPU build is installed;
+        # faiss-cpu has none of the GPU symbols, hence the hasattr guard
+        self._gpu_res = None
+        if hasattr(faiss, 'get_num_gpus') and faiss.get_num_gpus() > 0:
+            self._gpu_res = faiss.StandardGpuResources()
         self.data_dir = "app/data"
-        self.embeddings_file = os.path.join(self.data_dir, "embeddings.pkl")
+        self.embeddings_file = os.path.join(self.data_dir, "embeddings.pkl")  # legacy pickle cache
         self.index_file = os.path.join(self.data_dir, "faiss_index.bin")
+        self.meta_file = os.path.join(self.data_dir, "embeddings_meta.json")
+        self.scores_file = os.path.join(self.data_dir, "embedding_scores.npz")  # legacy archive
+        # One plain .npy per score array: np.load only honors mmap_mode
+        # for .npy files, not .npz archives
+        self._score_files = {
+            name: os.path.join(self.data_dir, f"embedding_scores_{name}.npy")
+            for name in ('recency', 'quality', 'readme_mult')
+        }
+        # Per-project vectors keyed by content hash, so unchanged projects
+        # skip the encoder on re-runs
+        self._vector_cache = _VectorCache(os.path.join(self.data_dir, "embeddings.sqlite"))
         
         # Initialize Gemini service for enhanced job description processing
         try:
-            self.gemini_service = GeminiService()
+            self.gemini_service = get_gemini_service()
         except Exception as e:
             print(f"Warning: Could not initialize Gemini service: {e}")
             print("Falling back to regex-based technology extraction")
@@ -32,8 +188,19 @@ class EmbeddingService:
         
         # Initialize or load FAISS index
         self.index = None
-        self.project_mapping = {}
+        self.project_names = []  # position-indexed by FAISS row id
         self.embeddings_cache = {}
+        # Score components aligned with FAISS row ids for vectorized gathers
+        self.recency_arr = np.empty(0, dtype=np.float32)
+        self.quality_arr = np.empty(0, dtype=np.float32)
+        self.readme_mult_arr = np.empty(0, dtype=np.float32)
+        # Projects and normalized tech sets, also indexed by FAISS row id
+        self.projects_by_id = []
+        self.tech_sets = []
+        # Integer tech ids: one sorted uint16 array per project, so overlap
+        # is a merge over small int arrays instead of Python set ops
+        self._tech_id_map = {}
+        self.project_tech_ids = []
         
         # Technology normalization mapping
         self.tech_normalize = {
@@ -48,7 +215,54 @@ class EmbeddingService:
             'express.js': 'express', 'expressjs': 'express',
             'next.js': 'nextjs', 'nuxt.js': 'nuxtjs'
         }
+
+        # Single fused alternation over the known tech vocabulary so local
+        # extraction scans the text once instead of once per name; longest
+        # names first so 'react.js' wins over 'react'
+        known_names = sorted(
+            set(self.tech_normalize) | set(self.tech_normalize.values()),
+            key=len, reverse=True
+        )
+        self._tech_scan_re = re.compile(
+            r'(?<![\w.])(' + '|'.join(re.escape(n) for n in known_names) + r')(?![\w.])',
+            re.IGNORECASE
+        )
+
+    def _scan_known_technologies(self, text: str) -> set:
+        """Extract normalized known technologies from text in one regex pass"""
+        return {
+            self.tech_normalize.get(m.lower(), m.lower())
+            for m in self._tech_scan_re.findall(text)
+        }
     
+    @cached_property
+    def model(self) -> SentenceTransformer:
+        """Lazily load the embedding model, shared across instances.
+
+        Requests that only search a previously-built index never pay the
+        model load; the first encode does. The lock keeps concurrent
+        requests in a threaded server from loading the ~420MB checkpoint
+        twice.
+        """
+        with _MODEL_CACHE_LOCK:
+            if self.model_name not in _MODEL_CACHE:
+                model = None
+                if self.device == 'cpu' and importlib.util.find_spec('onnxruntime') is not None:
+                    # ONNX Runtime avoids the PyTorch eager-mode overhead that
+                    # dominates single-sentence query encodes
+                    try:
+                        model = SentenceTransformer(self.model_name, device=self.device, backend='onnx')
+                    except Exception as e:
+                        print(f"Warning: ONNX backend unavailable, using torch: {e}")
+                if model is None:
+                    model = SentenceTransformer(self.model_name, device=self.device)
+                    if self.device == 'cuda':
+                        # fp16 halves memory traffic and roughly doubles throughput
+                        # on CUDA; outputs are cast back to fp32 before FAISS
+                        model.half()
+                _MODEL_CACHE[self.model_name] = model
+            return _MODEL_CACHE[self.model_name]
+
     def _normalize_technologies(self, technologies: List[str]) -> List[str]:
         """Normalize technology names for better matching"""
         normalized = []
@@ -65,146 +279,201 @@ class EmbeddingService:
             return ""
         
         # Remove markdown formatting
-        text = re.sub(r'!\[.*?\]\(.*?\)', '', text)  # Remove images
-        text = re.sub(r'\[.*?\]\(.*?\)', '', text)   # Remove links
-        text = re.sub(r'`{1,3}.*?`{1,3}', '', text, flags=re.DOTALL)  # Remove code blocks
-        text = re.sub(r'#{1,6}\s+', '', text)       # Remove headers
-        text = re.sub(r'\*{1,2}(.*?)\*{1,2}', r'\1', text)  # Remove bold/italic
+        text = _MD_IMG.sub('', text)       # Remove images
+        text = _MD_LINK.sub('', text)      # Remove links
+        text = _MD_CODE.sub('', text)      # Remove code blocks
+        text = _MD_HEADER.sub('', text)    # Remove headers
+        text = _MD_EMPHASIS.sub(r'\1', text)  # Remove bold/italic
         
         # Clean whitespace and normalize
         text = ' '.join(text.split())
         return text
     
-    def _create_weighted_text(self, project: Project) -> str:
-        """Create a weighted text representation focusing on key aspects"""
+    def _create_weighted_components(self, project: Project) -> List[tuple]:
+        """Create (text, weight) components focusing on key aspects.
+
+        Each component is encoded once and the weights are applied as an
+        embedding average, instead of repeating the text in the transformer
+        input (attention is quadratic in sequence length).
+        """
         components = []
-        
+
         # Core description (high weight)
         if project.detailed_paragraph:
-            clean_desc = self._clean_text(project.detailed_paragraph)
-            components.extend([clean_desc] * 3)  # 3x weight
-        
+            components.append((self._clean_text(project.detailed_paragraph), 3.0))
+
         # Technologies (very high weight for exact matching)
         if project.technologies:
             normalized_techs = self._normalize_technologies(project.technologies)
-            tech_text = f"Technologies used: {' '.join(normalized_techs)}"
-            components.extend([tech_text] * 4)  # 4x weight
-        
+            components.append((f"Technologies used: {' '.join(normalized_techs)}", 4.0))
+
         # Three-liner summary (medium weight)
         if project.three_liner:
-            clean_summary = self._clean_text(project.three_liner)
-            components.extend([clean_summary] * 2)  # 2x weight
-        
+            components.append((self._clean_text(project.three_liner), 2.0))
+
         # Repository description (low weight)
         if project.description and project.description != "No description provided":
-            clean_repo_desc = self._clean_text(project.description)
-            components.append(clean_repo_desc)  # 1x weight
-        
+            components.append((self._clean_text(project.description), 1.0))
+
         # Primary language (medium weight)
         if project.language and project.language != "Unknown":
-            lang_text = f"Primary language: {project.language.lower()}"
-            components.extend([lang_text] * 2)  # 2x weight
-        
-        return " ".join(components)
-    
-    def _calculate_recency_score(self, project: Project) -> float:
-        """Calculate recency score (0-1, where 1 is most recent)"""
-        if not project.created_at:
-            return 0.5  # Neutral score if date unknown
-        
-        now = datetime.now(timezone.utc)
-        if project.created_at.tzinfo is None:
-            project_date = project.created_at.replace(tzinfo=timezone.utc)
-        else:
-            project_date = project.created_at
-        
-        days_old = (now - project_date).days
-        
-        if days_old <= 30:
-            return 1.0
-        elif days_old <= 90:
-            return 0.9
-        elif days_old <= 180:
-            return 0.8
-        elif days_old <= 365:
-            return 0.6
-        elif days_old <= 730:  # 2 years
-            return 0.4
-        else:
-            return 0.2
+            components.append((f"Primary language: {project.language.lower()}", 2.0))
+
+        components = [(text, weight) for text, weight in components if text]
+        if not components:
+            components.append((project.name, 1.0))
+        return components
     
-    def _calculate_quality_score(self, project: Project) -> float:
-        """Calculate project quality score based on various indicators"""
-        score = 1.0
-        
-        # README quality penalties
-        if project.no_readme:
-            score *= 0.5  # Heavy penalty
-        elif project.bad_readme:
-            score *= 0.8  # Moderate penalty
-        
-        # GitHub engagement bonuses
-        if project.stars > 10:
-            score *= 1.2
-        elif project.stars > 50:
-            score *= 1.4
-        elif project.stars > 100:
-            score *= 1.6
-        
-        if project.forks > 5:
-            score *= 1.1
-        elif project.forks > 20:
-            score *= 1.3
-        
-        # Technology diversity bonus
-        if len(project.technologies) > 3:
-            score *= 1.1
-        elif len(project.technologies) > 6:
-            score *= 1.2
-        
-        return min(score, 2.0)  # Cap at 2.0
+    def _batch_recency_scores(self, projects: List[Project], now: datetime) -> np.ndarray:
+        """Recency scores (0-1, where 1 is most recent) for a whole batch"""
+        days = np.array([
+            (now - (p.created_at if p.created_at.tzinfo else p.created_at.replace(tzinfo=timezone.utc))).days
+            if p.created_at else -1
+            for p in projects
+        ], dtype=np.int64)
+
+        # Branchless lookup replacing the per-project if/elif ladder;
+        # unknown dates (days < 0) get a neutral 0.5
+        scores = _RECENCY_SCORES[np.searchsorted(_RECENCY_DAY_BOUNDS, days)]
+        return np.where(days < 0, 0.5, scores).astype(np.float32)
+
+    def _batch_quality_scores(self, projects: List[Project]) -> np.ndarray:
+        """Quality scores for a whole batch, from README state and GitHub engagement"""
+        stars = np.array([p.stars for p in projects], dtype=np.int64)
+        forks = np.array([p.forks for p in projects], dtype=np.int64)
+        tech_counts = np.array([len(p.technologies) for p in projects], dtype=np.int64)
+        no_readme = np.array([p.no_readme for p in projects], dtype=bool)
+        bad_readme = np.array([p.bad_readme for p in projects], dtype=bool)
+
+        # np.select picks the first matching condition, mirroring the
+        # original if/elif chains
+        score = np.select([no_readme, bad_readme], [0.5, 0.8], default=1.0)
+        score = score * np.select([stars > 10, stars > 50, stars > 100], [1.2, 1.4, 1.6], default=1.0)
+        score = score * np.select([forks > 5, forks > 20], [1.1, 1.3], default=1.0)
+        score = score * np.select([tech_counts > 3, tech_counts > 6], [1.1, 1.2], default=1.0)
+
+        return np.minimum(score, 2.0).astype(np.float32)  # Cap at 2.0
     
     def generate_embeddings_for_projects(self, projects: List[Project]):
         """Generate enhanced embeddings for all projects (excluding hidden ones)"""
         # Filter out hidden projects
         visible_projects = [p for p in projects if not getattr(p, 'hidden_from_search', False)]
         
-        # Prepare enhanced texts for embedding
-        project_texts = []
-        project_names = []
-        
-        for project in visible_projects:
-            weighted_text = self._create_weighted_text(project)
-            project_texts.append(weighted_text)
-            project_names.append(project.name)
-        
-        if not project_texts:
+        if not visible_projects:
             print("No visible projects to generate embeddings for")
             return
-        
-        # Generate embeddings
-        embeddings = self.model.encode(project_texts, convert_to_tensor=False)
-        
-        # Create FAISS index
-        dimension = embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dimension)  # Inner Product for cosine similarity
-        
+
+        project_names = [project.name for project in visible_projects]
+        project_components = [self._create_weighted_components(p) for p in visible_projects]
+
+        # Vectorized score computation across the whole batch, with the
+        # reference time taken once
+        now = datetime.now(timezone.utc)
+        recency_arr = self._batch_recency_scores(visible_projects, now)
+        quality_arr = self._batch_quality_scores(visible_projects)
+        recency_scores = dict(zip(project_names, recency_arr.tolist()))
+        quality_scores = dict(zip(project_names, quality_arr.tolist()))
+
+        # A project whose embedding-relevant text is unchanged since the
+        # last run reuses its stored vector; only misses hit the encoder
+        content_hashes = [
+            hashlib.sha256(orjson.dumps(comps)).hexdigest()
+            for comps in project_components
+        ]
+        cached_vecs = {
+            i: vec for i, h in enumerate(content_hashes)
+            if (vec := self._vector_cache.get(h)) is not None
+        }
+        miss_indices = [i for i in range(len(visible_projects)) if i not in cached_vecs]
+
+        miss_embeddings = None
+        if miss_indices:
+            # Weighted components of the miss projects, flattened so they
+            # encode as one batch
+            miss_components = [project_components[i] for i in miss_indices]
+            flat_texts = [text for comps in miss_components for text, _ in comps]
+            flat_weights = np.array(
+                [weight for comps in miss_components for _, weight in comps],
+                dtype=np.float32
+            )
+            component_counts = np.array([len(comps) for comps in miss_components])
+
+            # Generate component embeddings; large batches are embarrassingly
+            # parallel across the batch dimension, so fan out to a worker pool
+            # (fork semantics are unreliable on Windows, keep single-process there)
+            if len(flat_texts) > 500 and os.name != 'nt':
+                target_devices = ['cpu'] * 4 if self.device == 'cpu' else None
+                pool = self.model.start_multi_process_pool(target_devices)
+                try:
+                    component_embeddings = self.model.encode_multi_process(flat_texts, pool, batch_size=32)
+                finally:
+                    self.model.stop_multi_process_pool(pool)
+            else:
+                # Presort by length so each batch pads to a similar sequence
+                # length instead of the longest text in a mixed batch, then
+                # invert the permutation to restore component order
+                order = np.argsort([len(t) for t in flat_texts])
+                sorted_embeddings = self.model.encode(
+                    [flat_texts[i] for i in order],
+                    convert_to_numpy=True,
+                    device=self.device,
+                    batch_size=self.encode_batch_size,
+                    show_progress_bar=False
+                )
+                component_embeddings = np.empty_like(sorted_embeddings)
+                component_embeddings[order] = sorted_embeddings
+
+            # Weighted mean of each project's component embeddings - same
+            # semantics as repeating the text, without the extra transformer
+            # input length; copy=False skips the recast when encode already
+            # returned float32 (the common case)
+            component_embeddings = component_embeddings.astype('float32', copy=False)
+            offsets = np.concatenate(([0], np.cumsum(component_counts)[:-1]))
+            weighted_sums = np.add.reduceat(component_embeddings * flat_weights[:, None], offsets, axis=0)
+            weight_totals = np.add.reduceat(flat_weights, offsets)
+            miss_embeddings = weighted_sums / weight_totals[:, None]
+
+            self._vector_cache.set_many(
+                (content_hashes[i], miss_embeddings[j]) for j, i in enumerate(miss_indices)
+            )
+
+        # Assemble the full matrix in project order from cache hits and
+        # freshly computed vectors
+        dim = (miss_embeddings.shape[1] if miss_embeddings is not None
+               else next(iter(cached_vecs.values())).shape[0])
+        embeddings = np.empty((len(visible_projects), dim), dtype=np.float32)
+        for i, vec in cached_vecs.items():
+            embeddings[i] = vec
+        for j, i in enumerate(miss_indices):
+            embeddings[i] = miss_embeddings[j]
+
         # Normalize embeddings for cosine similarity
         faiss.normalize_L2(embeddings)
-        
-        # Add embeddings to index
-        self.index.add(embeddings.astype('float32'))
-        
-        # Create mapping
-        self.project_mapping = dict(enumerate(project_names))
-        
-        # Cache embeddings and projects with additional metadata
+
+        # Create FAISS index and add embeddings
+        self.index = self._to_search_device(self._build_index(embeddings))
+        self.index.add(embeddings)
+        
+        # Row id -> project name, plus score arrays aligned with FAISS ids
+        self.project_names = project_names
+        self.recency_arr = recency_arr
+        self.quality_arr = quality_arr
+        self.readme_mult_arr = np.array(
+            [0.5 if p.no_readme else (0.7 if p.bad_readme else 1.0) for p in visible_projects],
+            dtype=np.float32
+        )
+        self.projects_by_id = list(visible_projects)
+        self.tech_sets = [frozenset(self._normalize_technologies(p.technologies)) for p in visible_projects]
+        self._build_tech_id_arrays()
+
+        # Cache projects with additional metadata; the vectors themselves
+        # live only as quantized codes inside the index (recoverable via
+        # index.reconstruct_n if ever needed)
         self.embeddings_cache = {
-            'embeddings': embeddings,
             'projects': {project.name: project for project in visible_projects},
             'project_names': project_names,
-            'recency_scores': {project.name: self._calculate_recency_score(project) for project in visible_projects},
-            'quality_scores': {project.name: self._calculate_quality_score(project) for project in visible_projects}
+            'recency_scores': recency_scores,
+            'quality_scores': quality_scores
         }
         
         # Save to disk
@@ -212,21 +481,53 @@ class EmbeddingService:
         
         print(f"Successfully generated and saved enhanced embeddings for {len(projects)} projects")
     
+    def _build_index(self, embeddings: np.ndarray) -> faiss.Index:
+        """Build the FAISS index for the given (normalized) embeddings.
+
+        Small corpora get an exact IndexFlatIP; beyond ~5k projects a
+        brute-force scan is O(N*d) per query and the full fp32 matrix stays
+        resident, so switch to a partitioned+quantized IVFPQ index.
+        """
+        n, dimension = embeddings.shape
+        if n < 5000:
+            # Exact search over int8 codes: 4x smaller than fp32 with
+            # negligible recall loss on normalized vectors
+            index = faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+            return index
+
+        nlist = max(1, int(4 * np.sqrt(n)))
+        index = faiss.index_factory(dimension, f"IVF{nlist},PQ64x8", faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+        index.nprobe = 8
+        return index
+
+    def _to_search_device(self, index: faiss.Index) -> faiss.Index:
+        """Move the index to the GPU once so every search runs there"""
+        if self._gpu_res is not None:
+            return faiss.index_cpu_to_gpu(self._gpu_res, 0, index)
+        return index
+
     def _extract_job_information_with_gemini(self, job_description: str) -> Dict:
         """Extract comprehensive job information using Gemini AI"""
         try:
             return self.gemini_service.extract_job_description_for_embeddings(job_description)
         except Exception as e:
             print(f"Error using Gemini for job extraction: {e}")
+            # _gemini_fallback flags this as degraded keyword-only info so
+            # it is never cached; a later retry of the same job gets a
+            # fresh shot at the full extraction
             return {
-                'core_technologies': [],
+                'core_technologies': list(self._scan_known_technologies(job_description)),
                 'secondary_technologies': [],
                 'technical_keywords': [],
                 'experience_level': 'Not specified',
                 'domain_context': '',
                 'key_responsibilities': [],
                 'soft_skills': [],
-                'weighted_description': job_description
+                'weighted_description': job_description,
+                '_gemini_fallback': True
             }
             
     def _calculate_technology_overlap_score(self, project_techs: List[str], job_techs: List[str]) -> float:
@@ -234,187 +535,363 @@ class EmbeddingService:
         if not job_techs or not project_techs:
             return 0.0
         
-        project_techs_norm = set(self._normalize_technologies(project_techs))
-        job_techs_norm = set(job_techs)
-        
-        overlap = len(project_techs_norm.intersection(job_techs_norm))
-        total_job_techs = len(job_techs_norm)
-        
-        if total_job_techs == 0:
+        project_techs_norm = frozenset(self._normalize_technologies(project_techs))
+        job_techs_norm = set(self._normalize_technologies(job_techs))
+        return self._tech_overlap_from_sets(project_techs_norm, job_techs_norm)
+
+    def _tech_overlap_from_sets(self, project_techs: frozenset, job_techs: set) -> float:
+        """Overlap score on already-normalized tech sets (the hot-loop path)"""
+        if not job_techs or not project_techs:
             return 0.0
-        
+
+        overlap = len(project_techs & job_techs)
+
         # Calculate overlap percentage with bonus for exact matches
-        overlap_score = overlap / total_job_techs
-        
+        overlap_score = overlap / len(job_techs)
+
         # Bonus for having more technologies than required
-        if overlap > 0 and len(project_techs_norm) >= total_job_techs:
+        if overlap > 0 and len(project_techs) >= len(job_techs):
             overlap_score *= 1.2
-        
+
         return min(overlap_score, 1.5)  # Cap at 1.5 for exceptional matches
-    
+
+    def _build_tech_id_arrays(self):
+        """Assign each normalized tech an integer id and store one sorted
+        uint16 id array per project, aligned with the FAISS row ids"""
+        self._tech_id_map = {}
+        self.project_tech_ids = []
+        for techs in self.tech_sets:
+            ids = np.fromiter(
+                (self._tech_id_map.setdefault(t, len(self._tech_id_map)) for t in techs),
+                dtype=np.uint16, count=len(techs)
+            )
+            ids.sort()
+            self.project_tech_ids.append(ids)
+
+    def _job_tech_ids(self, job_techs: set) -> np.ndarray:
+        """Map normalized job techs to the known-tech id space (sorted);
+        techs no project uses get no id but still count in the denominator"""
+        ids = [self._tech_id_map[t] for t in job_techs if t in self._tech_id_map]
+        return np.sort(np.asarray(ids, dtype=np.uint16))
+
+    def _tech_overlap_from_ids(self, project_ids: np.ndarray, job_ids: np.ndarray,
+                               job_total: int) -> float:
+        """Same scoring as _tech_overlap_from_sets, over sorted int id arrays"""
+        if job_total == 0 or project_ids.shape[0] == 0:
+            return 0.0
+
+        overlap = _sorted_intersect_count(project_ids, job_ids)
+        overlap_score = overlap / job_total
+
+        if overlap > 0 and project_ids.shape[0] >= job_total:
+            overlap_score *= 1.2
+
+        return min(overlap_score, 1.5)
+
     def find_matching_projects(self, job_description: str, top_k: int = 4) -> List[MatchedProject]:
         """Enhanced project matching with AI-powered job analysis and multi-factor scoring"""
+        return self.find_matching_projects_batch([job_description], top_k)[0]
+
+    def find_matching_projects_batch(self, job_descriptions: List[str],
+                                     top_k: int = 4) -> List[List[MatchedProject]]:
+        """Match several job descriptions in one pass.
+
+        All uncached jobs are encoded in a single model.encode call and the
+        FAISS index is searched once with the full (nq, d) query matrix, so
+        pipeline usage (multiple uploaded JDs, nightly re-scoring) amortizes
+        the per-call overhead instead of issuing one search per job.
+        """
         try:
             # Load embeddings if not in memory
             if not self.index or not self.embeddings_cache:
                 self._load_embeddings()
-            
+
             if not self.index:
                 raise RuntimeError("No embeddings found. Please scrape GitHub repositories first.")
-            
-            # Extract comprehensive job information using Gemini
-            job_info = self._extract_job_information_with_gemini(job_description)
-            
-            # Combine all technologies for matching
-            all_job_technologies = (
-                job_info.get('core_technologies', []) + 
-                job_info.get('secondary_technologies', [])
-            )
-            all_job_technologies = self._normalize_technologies(all_job_technologies)
-            
-            # Create enhanced job description for embedding using Gemini's weighted description
-            weighted_desc = job_info.get('weighted_description', job_description)
-            technical_keywords = ' '.join(job_info.get('technical_keywords', []))
-            domain_context = job_info.get('domain_context', '')
-            
-            # Enhanced job text for better semantic matching
-            job_text_components = [
-                weighted_desc,
-                f"Required technologies: {' '.join(job_info.get('core_technologies', []))}",
-                f"Technical skills: {technical_keywords}",
-                f"Domain: {domain_context}"
-            ]
-            job_text = ' '.join([comp for comp in job_text_components if comp.strip()])
-            
-            # Generate embedding for job description
-            job_embedding = self.model.encode([job_text], convert_to_tensor=False)
-            faiss.normalize_L2(job_embedding)
-            
-            # Search for similar projects (get more than needed for filtering)
-            search_k = min(top_k * 3, len(self.project_mapping))
-            scores, indices = self.index.search(job_embedding.astype('float32'), search_k)
-            
-            candidate_projects = []
-            
-            for i, (semantic_score, idx) in enumerate(zip(scores[0], indices[0])):
-                if idx == -1:  # No more results
-                    break
-                
-                project_name = self.project_mapping[idx]
-                project = self.embeddings_cache['projects'][project_name]
-                
-                # Skip hidden projects
-                if getattr(project, 'hidden_from_search', False):
-                    continue
-                
-                # Calculate component scores
-                recency_score = self.embeddings_cache['recency_scores'][project_name]
-                quality_score = self.embeddings_cache['quality_scores'][project_name]
-                
-                # Enhanced technology overlap scoring with core vs secondary weighting
-                core_tech_overlap = self._calculate_technology_overlap_score(
-                    project.technologies, job_info.get('core_technologies', [])
-                )
-                secondary_tech_overlap = self._calculate_technology_overlap_score(
-                    project.technologies, job_info.get('secondary_technologies', [])
-                )
-                
-                # Weighted technology score (core techs are more important)
-                tech_overlap_score = (core_tech_overlap * 0.8 + secondary_tech_overlap * 0.2)
-                
-                # Enhanced scoring formula with improved weights
-                # Weights: semantic(0.35) + tech_overlap(0.4) + recency(0.15) + quality(0.1)
-                final_score = (
-                    float(semantic_score) * 0.35 +
-                    tech_overlap_score * 0.4 +
-                    recency_score * 0.15 +
-                    quality_score * 0.1
-                )
-                
-                # Additional bonuses/penalties
-                if project.no_readme:
-                    final_score *= 0.5  # Significant penalty
-                elif project.bad_readme:
-                    final_score *= 0.7  # Moderate penalty
-                
-                # Enhanced bonus system
-                if core_tech_overlap > 0.6:  # Strong core technology match
-                    final_score *= 1.3
-                elif core_tech_overlap > 0.3:  # Moderate core technology match
-                    final_score *= 1.15
-                
-                # Domain relevance bonus (if available)
-                domain_context = job_info.get('domain_context', '').lower()
-                if domain_context and any(keyword in project.detailed_paragraph.lower() 
-                                        for keyword in domain_context.split() if len(keyword) > 3):
-                    final_score *= 1.1
-                
-                candidate_projects.append({
-                    'project': project,
-                    'final_score': final_score,
-                    'semantic_score': float(semantic_score),
-                    'tech_overlap_score': tech_overlap_score,
-                    'core_tech_overlap': core_tech_overlap,
-                    'secondary_tech_overlap': secondary_tech_overlap,
-                    'recency_score': recency_score,
-                    'quality_score': quality_score
-                })
-            
-            # Sort by final score and take top k
-            candidate_projects.sort(key=lambda x: x['final_score'], reverse=True)
-            
-            matched_projects = []
-            for candidate in candidate_projects[:top_k]:
-                matched_project = MatchedProject(
-                    project=candidate['project'],
-                    similarity_score=candidate['final_score']
+
+            # Resolve job info per description; re-queries of the same job
+            # skip extraction and encoding entirely
+            job_infos, job_embeddings = [], []
+            to_encode = []  # (position, cache_key, job_text)
+            for job_description in job_descriptions:
+                cache_key = hashlib.blake2b(
+                    job_description.encode('utf-8'), digest_size=16
+                ).hexdigest()
+                cached = _JOB_CACHE.get(cache_key)
+                if cached is not None:
+                    _JOB_CACHE.move_to_end(cache_key)
+                    job_info, job_embedding = cached
+                    job_infos.append(job_info)
+                    job_embeddings.append(job_embedding)
+                else:
+                    job_info = self._resolve_job_info(job_description)
+                    job_infos.append(job_info)
+                    job_embeddings.append(None)
+                    to_encode.append((
+                        len(job_embeddings) - 1,
+                        cache_key,
+                        self._job_text_for_embedding(job_info, job_description)
+                    ))
+
+            if to_encode:
+                # One encode call for every uncached job; normalize inside
+                # the encoder while the tensor is still device-resident
+                # instead of a separate CPU pass over the matrix
+                encoded = self.model.encode(
+                    [text for _, _, text in to_encode],
+                    convert_to_tensor=False, device=self.device,
+                    normalize_embeddings=True
                 )
-                matched_projects.append(matched_project)
-            return matched_projects
-            
+                encoded = encoded.astype('float32', copy=False)
+                for (pos, cache_key, _), row in zip(to_encode, encoded):
+                    job_embedding = row[np.newaxis, :]
+                    job_embeddings[pos] = job_embedding
+                    # Info built from a failed Gemini call is usable for
+                    # this query but must not be pinned in the cache
+                    if job_infos[pos].get('_gemini_fallback'):
+                        continue
+                    _JOB_CACHE[cache_key] = (job_infos[pos], job_embedding)
+                    while len(_JOB_CACHE) > _JOB_CACHE_MAX:
+                        _JOB_CACHE.popitem(last=False)
+
+            # One search over the whole query matrix (get more hits than
+            # needed for filtering)
+            search_k = min(top_k * 3, len(self.project_names))
+            scores, indices = self.index.search(np.vstack(job_embeddings), search_k)
+
+            return [
+                self._rank_hits(job_infos[qi], scores[qi], indices[qi], top_k)
+                for qi in range(len(job_descriptions))
+            ]
+
         except Exception as e:
             print(f"Error finding matching projects: {str(e)}")
             raise e
 
+    def _resolve_job_info(self, job_description: str) -> Dict:
+        """Structured job info via the local fast path or Gemini extraction"""
+        # Fast path: for very short or keyword-only inputs the Gemini
+        # round-trip adds little over local keyword extraction
+        tokens = {t.strip('.,;:').lower() for t in job_description.split()}
+        known_techs = self._scan_known_technologies(job_description)
+        if len(job_description) < 200 or len(known_techs) >= 3:
+            return {
+                'core_technologies': list(known_techs),
+                'secondary_technologies': [],
+                'technical_keywords': list(tokens),
+                'experience_level': 'Not specified',
+                'domain_context': '',
+                'key_responsibilities': [],
+                'soft_skills': [],
+                'weighted_description': job_description
+            }
+        # Extract comprehensive job information using Gemini
+        return self._extract_job_information_with_gemini(job_description)
+
+    def _job_text_for_embedding(self, job_info: Dict, job_description: str) -> str:
+        """Build the keyword-enriched job text that gets embedded"""
+        # Create enhanced job description for embedding using Gemini's weighted description
+        weighted_desc = job_info.get('weighted_description', job_description)
+        technical_keywords = ' '.join(job_info.get('technical_keywords', []))
+        domain_context = job_info.get('domain_context', '')
+
+        # Enhanced job text for better semantic matching
+        job_text_components = [
+            weighted_desc,
+            f"Required technologies: {' '.join(job_info.get('core_technologies', []))}",
+            f"Technical skills: {technical_keywords}",
+            f"Domain: {domain_context}"
+        ]
+        return ' '.join([comp for comp in job_text_components if comp.strip()])
+
+    def _rank_hits(self, job_info: Dict, scores: np.ndarray, indices: np.ndarray,
+                   top_k: int) -> List[MatchedProject]:
+        """Score and rank one query's FAISS hits into MatchedProjects"""
+        # Drop empty slots and gather the id-aligned score components
+        # with fancy indexing instead of per-hit dict lookups
+        hit_ids = indices[indices != -1]
+        sem = scores[:len(hit_ids)].astype(np.float32)
+        rec = self.recency_arr[hit_ids]
+        qual = self.quality_arr[hit_ids]
+        readme_mult = self.readme_mult_arr[hit_ids]
+
+        domain_context = job_info.get('domain_context', '').lower()
+        domain_keywords = [kw for kw in domain_context.split() if len(kw) > 3]
+
+        # Normalize the job tech sets once per query and map them into
+        # the integer tech id space
+        core_set = set(self._normalize_technologies(job_info.get('core_technologies', [])))
+        secondary_set = set(self._normalize_technologies(job_info.get('secondary_technologies', [])))
+        core_ids = self._job_tech_ids(core_set)
+        secondary_ids = self._job_tech_ids(secondary_set)
+
+        # The remaining per-candidate Python work is the tech-set
+        # intersection and the domain keyword scan; everything else
+        # stays in NumPy arrays until the winners are known
+        kept_ids, core_arr, sec_arr, dom_hit_arr, keep = [], [], [], [], []
+
+        for row_id in hit_ids:
+            project = self.projects_by_id[row_id]
+
+            # Skip hidden projects
+            if getattr(project, 'hidden_from_search', False):
+                keep.append(False)
+                continue
+            keep.append(True)
+            kept_ids.append(row_id)
+
+            # Enhanced technology overlap scoring with core vs secondary weighting
+            project_ids = self.project_tech_ids[row_id]
+            core_arr.append(self._tech_overlap_from_ids(project_ids, core_ids, len(core_set)))
+            sec_arr.append(self._tech_overlap_from_ids(project_ids, secondary_ids, len(secondary_set)))
+
+            # Domain relevance bonus (if available)
+            detailed_lower = project.detailed_paragraph.lower()
+            dom_hit_arr.append(1.0 if any(kw in detailed_lower for kw in domain_keywords) else 0.0)
+
+        keep = np.asarray(keep, dtype=bool)
+        sem, rec = sem[keep], rec[keep]
+        qual, readme_mult = qual[keep], readme_mult[keep]
+
+        # Fused scoring over all candidates
+        # Weights: semantic(0.35) + tech_overlap(0.4) + recency(0.15) + quality(0.1)
+        final_scores = _score_candidates(
+            sem,
+            np.asarray(core_arr, dtype=np.float32),
+            np.asarray(sec_arr, dtype=np.float32),
+            rec,
+            qual,
+            readme_mult,
+            np.asarray(dom_hit_arr, dtype=np.float32)
+        )
+
+        # Partial selection: argpartition isolates the top_k winners in
+        # O(n), then only that slice is sorted for the final ordering
+        if top_k < len(final_scores):
+            top_idx = np.argpartition(-final_scores, top_k)[:top_k]
+        else:
+            top_idx = np.arange(len(final_scores))
+        top_idx = top_idx[np.argsort(-final_scores[top_idx])]
+
+        return [
+            MatchedProject(
+                project=self.projects_by_id[kept_ids[i]],
+                similarity_score=float(final_scores[i])
+            )
+            for i in top_idx
+        ]
+
     def _save_embeddings(self):
-        """Save embeddings and FAISS index to disk"""
+        """Save the FAISS index, score arrays and project metadata to disk"""
         try:
-            # Save FAISS index
-            faiss.write_index(self.index, self.index_file)
-            
-            # Save embeddings cache and mapping
-            save_data = {
-                'embeddings_cache': self.embeddings_cache,
-                'project_mapping': self.project_mapping,
-                'model_name': self.model_name
+            # Save FAISS index (write_index needs a CPU-resident index)
+            index = faiss.index_gpu_to_cpu(self.index) if self._gpu_res is not None else self.index
+            faiss.write_index(index, self.index_file)
+
+            # Score arrays as individual uncompressed .npy files so they
+            # can be memory-mapped on load
+            for name, arr in (
+                ('recency', self.recency_arr),
+                ('quality', self.quality_arr),
+                ('readme_mult', self.readme_mult_arr),
+            ):
+                np.save(self._score_files[name], np.asarray(arr))
+
+            # Project metadata as JSON instead of pickling model objects
+            meta = {
+                'model_name': self.model_name,
+                'project_names': self.project_names,
+                'recency_scores': self.embeddings_cache['recency_scores'],
+                'quality_scores': self.embeddings_cache['quality_scores'],
+                'projects': [p.model_dump(mode='json') for p in self.embeddings_cache['projects'].values()]
             }
-            with open(self.embeddings_file, 'wb') as f:
-                f.write(pickle.dumps(save_data))
-            
+            with open(self.meta_file, 'wb') as f:
+                f.write(orjson.dumps(meta))
+
         except Exception as e:
             print(f"Error saving embeddings: {str(e)}")
-    
+
     def _load_embeddings(self):
-        """Load embeddings and FAISS index from disk"""
+        """Load the FAISS index, score arrays and project metadata from disk"""
         try:
-            if not os.path.exists(self.embeddings_file) or not os.path.exists(self.index_file):
+            if os.path.exists(self.meta_file) and os.path.exists(self.index_file):
+                self.index = self._to_search_device(faiss.read_index(self.index_file))
+
+                with open(self.meta_file, 'rb') as f:
+                    meta = orjson.loads(f.read())
+                self.project_names = meta['project_names']
+
+                # Demand-loaded pages instead of deserializing the arrays up front
+                if all(os.path.exists(p) for p in self._score_files.values()):
+                    self.recency_arr = np.load(self._score_files['recency'], mmap_mode='r')
+                    self.quality_arr = np.load(self._score_files['quality'], mmap_mode='r')
+                    self.readme_mult_arr = np.load(self._score_files['readme_mult'], mmap_mode='r')
+                else:
+                    # Scores written by the short-lived .npz layout load
+                    # eagerly (np.load ignores mmap_mode for archives);
+                    # the next save migrates them to .npy
+                    score_arrays = np.load(self.scores_file)
+                    self.recency_arr = score_arrays['recency']
+                    self.quality_arr = score_arrays['quality']
+                    self.readme_mult_arr = score_arrays['readme_mult']
+
+                self.embeddings_cache = {
+                    'projects': {d['name']: Project(**d) for d in meta['projects']},
+                    'project_names': self.project_names,
+                    'recency_scores': meta['recency_scores'],
+                    'quality_scores': meta['quality_scores']
+                }
+            elif os.path.exists(self.embeddings_file) and os.path.exists(self.index_file):
+                # Legacy pickle cache from before the split storage format
+                self.index = self._to_search_device(faiss.read_index(self.index_file))
+                with open(self.embeddings_file, 'rb') as f:
+                    save_data = pickle.load(f)
+
+                self.embeddings_cache = save_data['embeddings_cache']
+                if 'project_names' in save_data:
+                    self.project_names = save_data['project_names']
+                    self.recency_arr = save_data['recency_arr']
+                    self.quality_arr = save_data['quality_arr']
+                    self.readme_mult_arr = save_data['readme_mult_arr']
+                else:
+                    mapping = save_data['project_mapping']
+                    self.project_names = [mapping[i] for i in range(len(mapping))]
+                    projects = self.embeddings_cache['projects']
+                    self.recency_arr = np.array(
+                        [self.embeddings_cache['recency_scores'][n] for n in self.project_names], dtype=np.float32)
+                    self.quality_arr = np.array(
+                        [self.embeddings_cache['quality_scores'][n] for n in self.project_names], dtype=np.float32)
+                    self.readme_mult_arr = np.array(
+                        [0.5 if projects[n].no_readme else (0.7 if projects[n].bad_readme else 1.0)
+                         for n in self.project_names], dtype=np.float32)
+            else:
                 print("No saved embeddings found")
                 return
-            
-            # Load FAISS index
-            self.index = faiss.read_index(self.index_file)
-            
-            # Load embeddings cache and mapping
-            with open(self.embeddings_file, 'rb') as f:
-                save_data = pickle.load(f)
-            
-            self.embeddings_cache = save_data['embeddings_cache']
-            self.project_mapping = save_data['project_mapping']
-            
-            print(f"Loaded enhanced embeddings for {len(self.project_mapping)} projects")
-            
+
+            # Rebuild the id-aligned project list and tech sets
+            projects = self.embeddings_cache['projects']
+            self.projects_by_id = [projects[n] for n in self.project_names]
+            self.tech_sets = [
+                frozenset(self._normalize_technologies(p.technologies)) for p in self.projects_by_id
+            ]
+            self._build_tech_id_arrays()
+
+            print(f"Loaded enhanced embeddings for {len(self.project_names)} projects")
+
         except Exception as e:
             print(f"Error loading embeddings: {str(e)}")
             self.index = None
             self.embeddings_cache = {}
-            self.project_mapping = {}
\ No newline at end of file
+            self.project_names = []
+
+@lru_cache(maxsize=1)
+def get_embedding_service() -> EmbeddingService:
+    """
+    Process-wide EmbeddingService singleton.
+
+    Constructing EmbeddingService loads the sentence-transformer model —
+    hundreds of MB and several seconds — so per-request instantiation paid
+    that cost for every scrape and match call; the cached factory loads
+    the model once and shares it (and the FAISS index) across requests.
+    """
+    return EmbeddingService()
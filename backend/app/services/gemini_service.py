@@ -1,25 +1,207 @@
+import asyncio
 import google.generativeai as genai
+import hashlib
 import os
 import json
+import orjson
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Template
+from typing import List, Optional
 
-class GeminiService:
-    def __init__(self):
-        apikey = os.getenv("GEMINI_API_KEY")
-        if not apikey:
-            raise ValueError("GEMINI_API_KEY environment variable not set")
-        genai.configure(api_key=apikey)
-        self.fast_model = genai.GenerativeModel("gemini-2.0-flash")
-        self.precise_model = genai.GenerativeModel("gemini-2.5-flash")
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.utils.colored_logger import setup_colored_logger
+
+logger = setup_colored_logger("gemini")
+
+# Retry policy for transient API failures (429 rate limits, 503s)
+_MAX_ATTEMPTS = 5
+_MAX_BACKOFF_SECONDS = 30
+
+# Worker threads for sync facades invoked from inside a running event
+# loop, where asyncio.run would raise RuntimeError. Each facade call
+# blocks its caller anyway, so a small pool is plenty.
+_SYNC_BRIDGE = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gemini-sync")
+
+
+def _run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Off the event loop, plain asyncio.run is enough. When the caller is
+    already on a running loop (a sync facade used inside an async FastAPI
+    route), asyncio.run is illegal there, so the coroutine is handed to a
+    worker thread that runs it on its own loop and the result is awaited
+    by blocking — same contract the facades have always had.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    return _SYNC_BRIDGE.submit(asyncio.run, coro).result()
+
+
+@dataclass(frozen=True)
+class GeminiConfig:
+    """API key and model names, resolved from the environment once.
+
+    Model IDs are env-overridable so a different model tier (or an
+    OpenAI-compatible proxy exposing the same names) can be flipped on
+    without code edits.
+    """
+    api_key: str
+    fast_model: str
+    precise_model: str
+
+
+@lru_cache(maxsize=1)
+def _get_config() -> GeminiConfig:
+    apikey = os.getenv("GEMINI_API_KEY")
+    if not apikey:
+        raise ValueError("GEMINI_API_KEY environment variable not set")
+    return GeminiConfig(
+        api_key=apikey,
+        fast_model=os.getenv("GEMINI_FAST_MODEL", "gemini-2.0-flash"),
+        precise_model=os.getenv("GEMINI_PRECISE_MODEL", "gemini-2.5-flash"),
+    )
+
+
+class ProjectSummary(BaseModel):
+    """Schema Gemini must follow when summarizing a repository"""
+    suggested_name: str
+    detailed: str
+    three_liner: str
+    technologies: List[str]
+    bad_readme: bool
+
+
+class JobAnalysis(BaseModel):
+    """Schema for the job description analysis shown to the user"""
+    title: str
+    company: str
+    required_technologies: List[str]
+    experience_level: str
+    soft_skills: List[str]
+    analysis_summary: str
+    requirements: str
+
+
+class CoverLetterResponse(BaseModel):
+    """Schema for the generated cover letter payload"""
+    company_name: str
+    cover_letter: str
 
-    def generate_project_summary(self, repo_name: str, readme_content: str, file_tree: list) -> dict:
-        """
-        Generate a detailed description, a concise 3-liner summary 
-        and used technologies for a GitHub repository description
-        """
 
-        readme_content = readme_content[:15000] if len(readme_content) > 15000 else readme_content
-        
-        prompt = f"""You will be given a readme file a github repository.
+# Validates the JSON array returned by batched summary calls
+_SUMMARY_LIST_ADAPTER = TypeAdapter(List[ProjectSummary])
+
+
+class JobParseAndLetter(BaseModel):
+    """Schema combining job analysis and cover letter in one response"""
+    job: JobAnalysis
+    letter: CoverLetterResponse
+
+
+class JobEmbeddingExtraction(BaseModel):
+    """Schema for the embedding-oriented job description extraction"""
+    core_technologies: List[str]
+    secondary_technologies: List[str]
+    technical_keywords: List[str]
+    experience_level: str
+    domain_context: str
+    key_responsibilities: List[str]
+    soft_skills: List[str]
+    weighted_description: str
+
+
+def _structured_config(schema: type, temperature: float = 0.0) -> genai.GenerationConfig:
+    """Constrain decoding to valid JSON matching the given schema.
+
+    The default temperature=0 keeps identical prompts producing identical
+    output, which is what makes the response cache below meaningful;
+    letter-writing tasks pass a small nonzero value for prose variety.
+    candidate_count=1 is the API default but is pinned explicitly so a
+    library default change can never silently multiply decode cost.
+    """
+    return genai.GenerationConfig(
+        response_mime_type="application/json",
+        response_schema=schema,
+        temperature=temperature,
+        candidate_count=1
+    )
+
+
+class _ResponseCache:
+    """Small sqlite-backed cache of raw Gemini response text.
+
+    Users iterating on a CV re-summarize the same READMEs and re-parse the
+    same job postings; with temperature=0 those calls are deterministic, so
+    a warm hit skips the multi-second API round trip and its token cost.
+    """
+
+    TTL_SECONDS = 86400 * 30
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, text TEXT, created REAL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        text, created = row
+        if time.time() - created > self.TTL_SECONDS:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+            return None
+        return text
+
+    def set(self, key: str, text: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, text, time.time())
+            )
+            self._conn.commit()
+
+
+# One cache shared by every GeminiService instance in the process
+_RESPONSE_CACHE = None
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _get_response_cache() -> _ResponseCache:
+    global _RESPONSE_CACHE
+    with _RESPONSE_CACHE_LOCK:
+        if _RESPONSE_CACHE is None:
+            _RESPONSE_CACHE = _ResponseCache(os.path.join("app", "data", "gemini_cache.sqlite3"))
+        return _RESPONSE_CACHE
+
+# README budget for the summary prompt, in (approximate) tokens rather than
+# characters so payload size is predictable regardless of prose density
+_README_MAX_TOKENS = 4000
+
+# Instruction blocks live in system_instruction on per-task model
+# instances, so they are uploaded once per model rather than resent as user
+# content on every call; the per-call Templates carry only the variable data
+_SUMMARY_INSTRUCTIONS = """You will be given a readme file a github repository.
     You need to generate these values for the given readme content:
     suggested_name: Extract the actual project name from the README if different from the repository name. Return "N/A" if no better name is found in the README.
     detailed: A detailed paragraph summarizing the project
@@ -27,19 +209,8 @@ class GeminiService:
     technologies: A list of key technologies used in the project
     bad_readme: A boolean indicating if the readme content is too short or not useful for understanding the project (true/false)
 
-    Your response for each question should be in the following format:
-    {{
-        "suggested_name": "Extracted project name or N/A",
-        "detailed": "Detailed paragraph here",
-        "three_liner": "3-liner paragraph (no return to line) summary here it should be a short and straight to the point",
-        "technologies": ["Technology 1", "Technology 2", ...],
-        "bad_readme": true/false
-    }}
-
     The response should adhere to the following:
     - For suggested_name: Look for project titles in headers, descriptions, or any section that indicates the actual project name. If the repository name seems generic or unclear (like "project1", "my-app", etc.), try to find a better descriptive name from the README content. Return "N/A" if no better name is found.
-    - Ensure the JSON is properly formatted.
-    - Only the json response should be returned no other data.
     - The 3 liner will be used in a CV so format it to be unambiguous and impactful and straight to the point (no long lines).
     - never mention the technologies in the three liner.
     - The detailed paragraph should provide a comprehensive overview of the project.
@@ -55,84 +226,66 @@ class GeminiService:
     - Formatting examples of not acceptable technologies: "Node.js v14 -> Node.js", "React 17 -> React", "PostgreSQL database -> PostgreSQL", "Docker containerization -> Docker", "Long Short-Term Memory (LSTM) -> LSTM".
     - If the readme is too short or not useful, set "bad_readme" to true.
     - If "bad_readme" is true, the "detailed" and "three_liner" can be generic but still relevant to the project.
-    
-    Here is the repository information:
-    Repository Name: {repo_name}
-    
+"""
+
+_SUMMARY_PROMPT = Template("""Here is the repository information:
+    Repository Name: ${repo_name}
+
     Readme content:
-    {readme_content}
-    
+    ${readme_content}
+
     File tree:
-    {','.join(file_tree[:50]) if file_tree else 'N/A'}
+    ${file_tree}
 
-"""
-        
-        response = self.precise_model.generate_content([prompt])
-        json_response = self._extract_json(response.text)
+""")
 
-        return json_response
+_SUMMARY_BATCH_INSTRUCTIONS = _SUMMARY_INSTRUCTIONS + """
+    You will be given several repositories in one request. Return a JSON
+    array with exactly one object per repository, in the same order the
+    repositories are given.
+"""
 
-    def job_description_parser(self, job_description: str) -> dict:
-        """
-        Parse job description to extract title, company, description, and requirements
-        """
-        print("Parsing job description with Gemini...")
-        prompt = f"""You will be given a job description text.
+_JOB_PARSER_INSTRUCTIONS = """You will be given a job description text.
     Extract the following fields and return them in a JSON format:
     - title: Job title
     - company: Company name
     - required_technologies: List of key technologies required
     - experience_level: Experience level required (e.g., Junior, Senior)
     - soft_skills: List of important soft skills mentioned
-    - analysis_summary: A brief summary of the job highlighting main points    
+    - analysis_summary: A brief summary of the job highlighting main points (3-5 lines)
     - requirements: Key requirements or qualifications
-    Your response should be in the following format:
-    {{
-        "title": "Job Title",
-        "company": "Company Name",
-        "required_technologies": ["Tech 1", "Tech 2", ...],
-        "experience_level": "Experience Level",
-        "soft_skills": ["Skill 1", "Skill 2", ...],
-        "analysis_summary": "Brief summary here of the job highlighting main points (3-5 lines)",
-        "requirements": "Key requirements here"
-    }}
-
-    Job description:
-    {job_description}
-    """
+"""
 
-        response = self.fast_model.generate_content([prompt])
-        json_response = self._extract_json(response.text)
+_JOB_PARSER_PROMPT = Template("""Job description:
+    ${job_description}
+    """)
 
-        return {**json_response, "full_description": job_description}
+_EMBED_EXTRACT_INSTRUCTIONS = """You will be given a job description text. Extract and structure the following information to optimize it for embedding-based project matching:
 
-    def generate_cover_letter(self, template_text: str, job_description: str, projects: list) -> tuple[str, str]:
-        """
-        Generate cover letter content using template, job description, and relevant projects
-        """
-        # Prepare project information
-        project_info = ""
-        for i, matched_project in enumerate(projects, 1):
-            project = matched_project.project
-            project_name = project.suggested_name if project.suggested_name else project.name
-            project_info += f"""
-            Project {i}: {project_name}
-            - Description: {project.detailed_paragraph}
-            - three liner: {project.three_liner}
-            - Technologies: {', '.join(project.technologies)}
-            """
-        
-        prompt = f"""You are an expert professional cover letter writer. Create a compelling, personalized cover letter that follows modern best practices and stands out to hiring managers.
-
-    TEMPLATE TO FOLLOW (adapt the structure, tone and style):
-    {template_text}
+    Extract the following fields and return them in JSON format:
+    - core_technologies: List of essential technical skills/technologies required (e.g., Python, React, Docker)
+    - secondary_technologies: List of nice-to-have or secondary technologies mentioned
+    - technical_keywords: List of important technical terms, frameworks, methodologies mentioned
+    - experience_level: Required experience level (Junior, Mid-level, Senior, etc.)
+    - domain_context: Brief description of the business domain/industry context
+    - key_responsibilities: List of main job responsibilities that might match project work
+    - soft_skills: Important soft skills mentioned
+    - weighted_description: A condensed, keyword-rich version of the job description optimized for embedding matching
 
-    JOB INFORMATION:
-    {job_description}
+    Guidelines:
+    - Focus on technologies that would be used in actual projects/repositories
+    - Normalize technology names (e.g., "React.js" -> "React", "Node.js" -> "Node.js")
+    - Include both exact technology names and broader categories
+    - The weighted_description should emphasize the most important technical requirements
+    - Extract technical methodologies (e.g., "Agile", "TDD", "Microservices")
+    - Include relevant technical domains (e.g., "machine learning", "web development", "mobile")
+"""
 
+_EMBED_EXTRACT_PROMPT = Template("""Job description:
+    ${job_description}
+    """)
 
-    RELEVANT PROJECTS (if relevant to the job, incorporate 1-2 max naturally):
-    {project_info}
+_COVER_LETTER_INSTRUCTIONS = """You are an expert professional cover letter writer. Create a compelling, personalized cover letter that follows modern best practices and stands out to hiring managers.
 
     INSTRUCTIONS:
     1. Follow the structure and tone of the provided template
@@ -145,92 +298,472 @@ class GeminiService:
     8. Keep it concise and impactful (2-3 paragraphs)
     9. Don't include placeholder text like [Your Name] or [Company Name] - use actual values
     10. Return only the body paragraphs of the cover letter, without salutation or closing
-    
+
     IMPORTANT:
     1. The text will be used in a LaTeX template so avoid any special characters that could break the formatting
     2. You can use latex commands for formatting like textbf for bold and try to make empty lines between paragraphs.
     2. don't include package imports or document structure just the letter content
     4. Don't make the cover letter long a maximum of 3 paragraphs with max 300 words for the entire letter
-    
-    return a json with two keys and no other text just the json:
-    {{
-        "company_name": "the company name extracted from the job description no spaces or special characters",
-        "cover_letter": "the full text of the cover letter following the template structure and tone"
-    }}
+
+    For company_name: the company name extracted from the job description, no spaces or special characters.
+    For cover_letter: the full text of the cover letter following the template structure and tone.
 """
 
-        response = self.precise_model.generate_content([prompt])
-        json_response = self._extract_json(response.text)
+_COVER_LETTER_PROMPT = Template("""TEMPLATE TO FOLLOW (adapt the structure, tone and style):
+    ${template_text}
+
+    JOB INFORMATION:
+    ${job_description}
+
+
+    RELEVANT PROJECTS (if relevant to the job, incorporate 1-2 max naturally):
+    ${project_info}
+""")
+
+
+_PARSE_AND_WRITE_INSTRUCTIONS = (
+    """You will analyze a job description AND write a cover letter for it in a single response.
+
+    For the "job" field:
+"""
+    + _JOB_PARSER_INSTRUCTIONS.split("\n", 1)[1]
+    + """
+    For the "letter" field:
+    """
+    + _COVER_LETTER_INSTRUCTIONS
+)
+
+_PARSE_AND_WRITE_PROMPT = Template("""TEMPLATE TO FOLLOW (adapt the structure, tone and style):
+    ${template_text}
+
+    JOB DESCRIPTION:
+    ${job_description}
+
+
+    RELEVANT PROJECTS (if relevant to the job, incorporate 1-2 max naturally):
+    ${project_info}
+""")
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to an approximate token budget, cutting at a whitespace
+    boundary so no word is split. ASCII prose averages ~4 chars per token
+    while CJK and emoji tokenize to roughly one token per character, so
+    non-ASCII characters are weighted accordingly instead of letting a
+    character cut blow the budget by 4x. The real Gemini tokenizer is only
+    reachable via a count_tokens network call, which would defeat the
+    purpose here.
+    """
+    if text.isascii():
+        limit = max_tokens * 4
+        if len(text) <= limit:
+            return text
+    elif len(text) <= max_tokens:
+        # Even at one token per character the text fits
+        return text
+    else:
+        estimate = 0.0
+        limit = len(text)
+        for i, ch in enumerate(text):
+            estimate += 0.25 if ord(ch) < 128 else 1.0
+            if estimate > max_tokens:
+                limit = i
+                break
+        if limit == len(text):
+            return text
+    cut = text.rfind(' ', 0, limit)
+    return text[:cut] if cut > 0 else text[:limit]
+
+
+class GeminiService:
+    def __init__(self):
+        cfg = _get_config()
+        genai.configure(api_key=cfg.api_key)
+        self.fast_model = genai.GenerativeModel(cfg.fast_model)
+        self.precise_model = genai.GenerativeModel(cfg.precise_model)
+        # Per-task models carry their instruction blocks as
+        # system_instruction, so the static preamble is uploaded once per
+        # model instead of being resent in every request body
+        self.summary_model = genai.GenerativeModel(
+            cfg.fast_model, system_instruction=_SUMMARY_INSTRUCTIONS)
+        self.summary_batch_model = genai.GenerativeModel(
+            cfg.fast_model, system_instruction=_SUMMARY_BATCH_INSTRUCTIONS)
+        self.job_parser_model = genai.GenerativeModel(
+            cfg.fast_model, system_instruction=_JOB_PARSER_INSTRUCTIONS)
+        self.embed_extract_model = genai.GenerativeModel(
+            cfg.fast_model, system_instruction=_EMBED_EXTRACT_INSTRUCTIONS)
+        self.cover_letter_model = genai.GenerativeModel(
+            cfg.precise_model, system_instruction=_COVER_LETTER_INSTRUCTIONS)
+        # The combined call carries letter prose, so it runs on the same
+        # tier as the dedicated cover letter model
+        self.parse_and_write_model = genai.GenerativeModel(
+            cfg.precise_model, system_instruction=_PARSE_AND_WRITE_INSTRUCTIONS)
+        self.cache = _get_response_cache()
+
+    async def _cached_generate_async(self, model, task: str, prompt: str,
+                                     generation_config: genai.GenerationConfig) -> str:
+        """
+        Return the response text for a prompt, serving repeats from the
+        deterministic response cache instead of calling the API again.
+        The task label keys the cache per system instruction, since model
+        names alone no longer identify the full request. Only
+        temperature-0 tasks touch the cache at all: nonzero-temperature
+        output (the letter-writing tasks) is intentionally varied, and
+        caching it would hand back the same letter for the whole TTL.
+        """
+        cacheable = not generation_config.temperature
+        key = hashlib.sha256(f"{task}|{model.model_name}|{prompt}".encode()).hexdigest()
+        if cacheable:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        # Transient 429/503s are retried with jittered exponential backoff
+        # so one rate-limit blip doesn't fail a whole batched gather
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                text = await self._stream_first_object(model, prompt, generation_config)
+                break
+            except (ResourceExhausted, ServiceUnavailable) as e:
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise
+                delay = min(_MAX_BACKOFF_SECONDS, 2 ** attempt) * (0.5 + random.random())
+                logger.warning("Transient Gemini error (%s), retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+
+        if not cacheable:
+            return text
+
+        # Only structurally valid JSON enters the cache; a truncated or
+        # malformed response would otherwise be replayed for the whole TTL
+        try:
+            orjson.loads(text)
+        except orjson.JSONDecodeError:
+            logger.warning("Response for task %s is not valid JSON, not caching", task)
+            return text
+
+        self.cache.set(key, text)
+        return text
+
+    async def _stream_first_object(self, model, prompt: str,
+                                   generation_config: genai.GenerationConfig) -> str:
+        """
+        Stream the response and stop as soon as the top-level JSON value
+        closes; every call here is structured output, so anything after
+        that point is trailing whitespace we would otherwise wait for.
+        The top-level value is an object for single-item schemas and an
+        array for the batched summary schema, so decoding starts from
+        whichever of '{' or '[' appears first.
+        """
+        stream = await model.generate_content_async(
+            [prompt], generation_config=generation_config, stream=True
+        )
+        decoder = json.JSONDecoder()
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk.text)
+            buffered = ''.join(chunks)
+            starts = [s for s in (buffered.find('{'), buffered.find('[')) if s != -1]
+            if not starts:
+                continue
+            try:
+                decoder.raw_decode(buffered, min(starts))
+            except json.JSONDecodeError:
+                continue
+            break
+
+        return ''.join(chunks)
+
+    def generate_project_summary(self, repo_name: str, readme_content: str, file_tree: list) -> dict:
+        """
+        Sync facade over generate_project_summary_async for legacy callers
+        """
+        return _run_sync(self.generate_project_summary_async(repo_name, readme_content, file_tree))
+
+    async def generate_project_summary_async(self, repo_name: str, readme_content: str, file_tree: list) -> dict:
+        """
+        Generate a detailed description, a concise 3-liner summary
+        and used technologies for a GitHub repository description
+        """
+        prompt = self._project_summary_prompt(repo_name, readme_content, file_tree)
+
+        # Schema-shaped extraction is what the fast tier is for; with
+        # response_schema constraining the output there is no field drift
+        # for the precise model to compensate. 2.5-flash stays reserved for
+        # the cover letter where prose quality matters.
+        text = await self._cached_generate_async(
+            self.summary_model, "summary", prompt, _structured_config(ProjectSummary)
+        )
+        return self._parse_structured(text, ProjectSummary)
+
+    async def generate_project_summaries(self, items: list) -> list:
+        """
+        Generate summaries for several repositories concurrently.
+        Each item is a (repo_name, readme_content, file_tree) tuple; results
+        come back in the same order. Calls are I/O-bound network requests,
+        so they are fired in parallel with a semaphore of 8 to stay inside
+        the API rate limits.
+        """
+        semaphore = asyncio.Semaphore(8)
+
+        async def generate_one(item: tuple) -> dict:
+            async with semaphore:
+                return await self.generate_project_summary_async(*item)
+
+        return list(await asyncio.gather(*(generate_one(item) for item in items)))
+
+    async def generate_project_summaries_batch(self, items: list, chunk_size: int = 5) -> list:
+        """
+        Summarize several repositories with one Gemini call per chunk.
+        Each item is a (repo_name, readme_content, file_tree) tuple; chunks
+        of chunk_size repos share a single prompt that returns a JSON array,
+        so N repos cost ceil(N/chunk_size) calls instead of N and the
+        instruction tokens are amortized across the chunk. Results come
+        back as dicts in input order. A chunk whose response does not line
+        up one-to-one with its repos falls back to per-repo calls, and a
+        repo whose call fails outright yields {} so the caller's heuristic
+        fallbacks take over — one bad repo or chunk never fails the rest.
+        """
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        semaphore = asyncio.Semaphore(8)
+
+        async def summarize_one(item: tuple) -> dict:
+            try:
+                return await self.generate_project_summary_async(*item)
+            except Exception as e:
+                logger.warning("Summary failed for %s, leaving it to heuristics: %s", item[0], e)
+                return {}
+
+        async def summarize_chunk(chunk: list) -> list:
+            parsed = []
+            try:
+                async with semaphore:
+                    prompt = "\n".join(
+                        f"Repository {j}:\n" + self._project_summary_prompt(*item)
+                        for j, item in enumerate(chunk, 1)
+                    )
+                    text = await self._cached_generate_async(
+                        self.summary_batch_model, "summary_batch", prompt,
+                        _structured_config(list[ProjectSummary])
+                    )
+                    parsed = self._parse_structured_list(text)
+                    if len(parsed) == len(chunk):
+                        return parsed
+                # Misaligned or unparseable array: re-do this chunk one repo
+                # at a time so a single bad batch cannot corrupt every repo
+                # in it
+                logger.warning("Batch summary returned %d entries for %d repos, retrying individually",
+                               len(parsed), len(chunk))
+            except Exception as e:
+                logger.warning("Batch summary call failed, retrying repos individually: %s", e)
+            return list(await asyncio.gather(*(summarize_one(item) for item in chunk)))
+
+        results = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+        return [summary for chunk_result in results for summary in chunk_result]
+
+    def _parse_structured_list(self, text: str) -> list:
+        """
+        Validate a batched summary response against the array schema,
+        falling back to a plain JSON parse when validation fails
+        """
+        try:
+            return [m.model_dump() for m in _SUMMARY_LIST_ADAPTER.validate_json(text)]
+        except ValidationError:
+            try:
+                data = orjson.loads(text)
+            except orjson.JSONDecodeError:
+                return []
+            if isinstance(data, dict):
+                return [data]
+            return data if isinstance(data, list) else []
+
+    def _project_summary_prompt(self, repo_name: str, readme_content: str, file_tree: list) -> str:
+        """
+        Build the project summary prompt shared by the sync and async paths
+        """
+        # The scraper already caps and sorts the tree at ingest, so no
+        # defensive slice is needed here
+        return _SUMMARY_PROMPT.substitute(
+            repo_name=repo_name,
+            readme_content=_truncate_to_tokens(readme_content, _README_MAX_TOKENS),
+            file_tree=','.join(file_tree) if file_tree else 'N/A'
+        )
+
+    def job_description_parser(self, job_description: str) -> dict:
+        """
+        Sync facade over job_description_parser_async for legacy callers
+        """
+        return _run_sync(self.job_description_parser_async(job_description))
+
+    async def job_description_parser_async(self, job_description: str) -> dict:
+        """
+        Parse job description to extract title, company, description, and requirements
+        """
+        logger.info("Parsing job description with Gemini...")
+        prompt = _JOB_PARSER_PROMPT.substitute(job_description=job_description)
+
+        text = await self._cached_generate_async(
+            self.job_parser_model, "job_parse", prompt, _structured_config(JobAnalysis)
+        )
+        json_response = self._parse_structured(text, JobAnalysis)
+
+        return {**json_response, "full_description": job_description}
+
+    def generate_cover_letter(self, template_text: str, job_description: str, projects: list) -> tuple[str, str]:
+        """
+        Sync facade over generate_cover_letter_async for legacy callers
+        """
+        return _run_sync(self.generate_cover_letter_async(template_text, job_description, projects))
+
+    async def generate_cover_letter_async(self, template_text: str, job_description: str, projects: list) -> tuple[str, str]:
+        """
+        Generate cover letter content using template, job description, and relevant projects
+        """
+        prompt = _COVER_LETTER_PROMPT.substitute(
+            template_text=template_text,
+            job_description=job_description,
+            project_info=self._project_info_block(projects)
+        )
+
+        text = await self._cached_generate_async(
+            self.cover_letter_model, "cover_letter", prompt,
+            _structured_config(CoverLetterResponse, temperature=0.4)
+        )
+        json_response = self._parse_structured(text, CoverLetterResponse)
         response_text = json_response.get("cover_letter", "").replace("\\\\n", "\n")
         comp = json_response.get("company_name", "")
         return response_text, comp
 
+    def _project_info_block(self, projects: list) -> str:
+        """
+        Format matched projects for a prompt; a single join instead of
+        repeated string concatenation across projects
+        """
+        return "\n".join(
+            f"""
+            Project {i}: {mp.project.suggested_name if mp.project.suggested_name else mp.project.name}
+            - Description: {mp.project.detailed_paragraph}
+            - three liner: {mp.project.three_liner}
+            - Technologies: {', '.join(mp.project.technologies)}
+            """
+            for i, mp in enumerate(projects, 1)
+        )
+
+    def parse_and_write(self, job_description: str, template_text: str, projects: list) -> tuple[dict, str, str]:
+        """
+        Sync facade over parse_and_write_async for legacy callers
+        """
+        return _run_sync(self.parse_and_write_async(job_description, template_text, projects))
+
+    async def parse_and_write_async(self, job_description: str, template_text: str, projects: list) -> tuple[dict, str, str]:
+        """
+        Parse a job description and write its cover letter in one Gemini
+        call. The letter path previously made two sequential round trips
+        (job_description_parser, then generate_cover_letter) over the same
+        job text; the combined schema returns both in a single response.
+        Returns (job_analysis, cover_letter_text, company_name).
+        job_description_parser stays available as a cheaper standalone call
+        for flows that only need the analysis.
+        """
+        logger.info("Parsing job description and writing cover letter with Gemini...")
+        prompt = _PARSE_AND_WRITE_PROMPT.substitute(
+            template_text=template_text,
+            job_description=job_description,
+            project_info=self._project_info_block(projects)
+        )
+
+        text = await self._cached_generate_async(
+            self.parse_and_write_model, "parse_and_write", prompt,
+            _structured_config(JobParseAndLetter, temperature=0.4)
+        )
+        json_response = self._parse_structured(text, JobParseAndLetter)
+
+        job_analysis = {**json_response.get("job", {}), "full_description": job_description}
+        letter = json_response.get("letter", {})
+        response_text = letter.get("cover_letter", "").replace("\\\\n", "\n")
+        comp = letter.get("company_name", "")
+        return job_analysis, response_text, comp
+
     def extract_job_description_for_embeddings(self, job_description: str) -> dict:
+        """
+        Sync facade over extract_job_description_for_embeddings_async for legacy callers
+        """
+        return _run_sync(self.extract_job_description_for_embeddings_async(job_description))
+
+    async def extract_job_description_for_embeddings_async(self, job_description: str) -> dict:
         """
         Extract and structure job description information optimized for embeddings.
         Returns key components that improve job-to-project matching quality.
         """
-        print("Extracting job description with Gemini for embeddings...")
-        
-        prompt = f"""You will be given a job description text. Extract and structure the following information to optimize it for embedding-based project matching:
-
-    Extract the following fields and return them in JSON format:
-    - core_technologies: List of essential technical skills/technologies required (e.g., Python, React, Docker)
-    - secondary_technologies: List of nice-to-have or secondary technologies mentioned
-    - technical_keywords: List of important technical terms, frameworks, methodologies mentioned
-    - experience_level: Required experience level (Junior, Mid-level, Senior, etc.)
-    - domain_context: Brief description of the business domain/industry context
-    - key_responsibilities: List of main job responsibilities that might match project work
-    - soft_skills: Important soft skills mentioned
-    - weighted_description: A condensed, keyword-rich version of the job description optimized for embedding matching
+        logger.info("Extracting job description with Gemini for embeddings...")
 
-    Your response should be in the following format:
-    {{
-        "core_technologies": ["Technology 1", "Technology 2", ...],
-        "secondary_technologies": ["Tech 1", "Tech 2", ...],
-        "technical_keywords": ["keyword1", "keyword2", ...],
-        "experience_level": "Experience Level",
-        "domain_context": "Brief domain description",
-        "key_responsibilities": ["responsibility1", "responsibility2", ...],
-        "soft_skills": ["skill1", "skill2", ...],
-        "weighted_description": "Keyword-rich condensed description for embeddings"
-    }}
+        prompt = _EMBED_EXTRACT_PROMPT.substitute(job_description=job_description)
 
-    Guidelines:
-    - Focus on technologies that would be used in actual projects/repositories
-    - Normalize technology names (e.g., "React.js" -> "React", "Node.js" -> "Node.js")
-    - Include both exact technology names and broader categories
-    - The weighted_description should emphasize the most important technical requirements
-    - Extract technical methodologies (e.g., "Agile", "TDD", "Microservices")
-    - Include relevant technical domains (e.g., "machine learning", "web development", "mobile")
+        text = await self._cached_generate_async(
+            self.embed_extract_model, "embed_extract", prompt, _structured_config(JobEmbeddingExtraction)
+        )
+        return self._parse_structured(text, JobEmbeddingExtraction)
 
-    Job description:
-    {job_description}
-    """
-
-        response = self.fast_model.generate_content([prompt])
-        json_response = self._extract_json(response.text)
-        
-        return json_response
+    def _parse_structured(self, text: str, schema: type) -> dict:
+        """
+        Validate a structured-output response against its schema; constrained
+        decoding makes failures rare, but fall back to the legacy extraction
+        rather than surfacing a ValidationError to callers
+        """
+        try:
+            return schema.model_validate_json(text).model_dump()
+        except ValidationError:
+            return self._extract_json(text)
 
     def _extract_json(self, text: str) -> dict:
         """
-        Extract JSON object from text
+        Extract the first valid JSON object from text
         """
-        try:        
+        try:
             json_start = text.find('{')
             json_end = text.rfind('}') + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = text[json_start:json_end]
-                parsed_json = json.loads(json_str)
-                return parsed_json
-            else:
-                print("Warning: Could not find valid JSON in response")
+
+            if json_start < 0 or json_end <= json_start:
+                logger.warning("Could not find valid JSON in response")
                 return {}
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {str(e)}")
+
+            # Fast path: the whole find/rfind span is one clean object,
+            # which is the overwhelmingly common shape of a Gemini reply
+            try:
+                return orjson.loads(text[json_start:json_end])
+            except orjson.JSONDecodeError:
+                pass
+
+            # Robust path: prose or code fences around the object can put
+            # stray braces inside the span. raw_decode parses in place from
+            # each '{' candidate until one yields a valid object, with no
+            # slicing and no guess about where the object ends.
+            decoder = json.JSONDecoder()
+            idx = json_start
+            while idx != -1:
+                try:
+                    obj, _ = decoder.raw_decode(text, idx)
+                    if isinstance(obj, dict):
+                        return obj
+                except json.JSONDecodeError:
+                    pass
+                idx = text.find('{', idx + 1)
+
+            logger.warning("Could not find valid JSON in response")
             return {}
         except Exception as e:
-            print(f"Error extracting JSON: {str(e)}")
-            return {}
\ No newline at end of file
+            logger.error("Error extracting JSON: %s", e)
+            return {}
+
+@lru_cache(maxsize=1)
+def get_gemini_service() -> GeminiService:
+    """
+    Process-wide GeminiService singleton.
+
+    Callers that previously did GeminiService() per request were re-running
+    genai.configure and rebuilding both GenerativeModel wrappers each time;
+    the cached factory reuses them (and the underlying HTTP session) for
+    the life of the process.
+    """
+    return GeminiService()
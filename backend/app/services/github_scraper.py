@@ -1,18 +1,383 @@
+import base64
+import io
 import json
+import orjson
 import os
 import re
+import tarfile
+import zstandard
 import asyncio
+import httpx
+import sqlite3
+import threading
+import time
+import numpy as np
 from typing import List, Optional
 from github import Github
 from datetime import datetime
+from pydantic import TypeAdapter
 from app.models.project import Project
-from app.services.embeddings import EmbeddingService
-from app.services.gemini_service import GeminiService
+from app.services.embeddings import get_embedding_service
+from app.services.gemini_service import GeminiService, get_gemini_service
 from github import Repository
 from concurrent.futures import ThreadPoolExecutor
 from app.utils.colored_logger import get_scraper_logger, log_progress, log_success, log_warning, log_error
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Only this many file paths are kept per repository; the summary prompt never
+# uses more, and capping at the producer keeps stored project JSON small.
+# Sorting first makes the kept subset (and thus Gemini cache keys) stable
+# across API ordering churn.
+_MAX_TREE_ENTRIES = 50
+
+# Bounds on the tarball fast path: compressed bytes consumed before the
+# download is abandoned for the REST fallback, and file paths scanned
+# before the member walk stops early. Source repositories sit comfortably
+# under both; media/dataset-heavy ones bail out instead of soaking up the
+# transfer budget.
+_TARBALL_MAX_BYTES = 64 * 1024 * 1024
+_TARBALL_SCAN_MAX = 10_000
+
+
+class _BoundedIterReader(io.RawIOBase):
+    """File-like view over an httpx byte iterator for stream-mode tarfile,
+    raising once max_bytes have been consumed so one oversized archive
+    cannot buffer in memory or eat the transfer budget"""
+
+    def __init__(self, iterator, max_bytes: int):
+        self._iterator = iterator
+        self._max_bytes = max_bytes
+        self._consumed = 0
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            chunk = next(self._iterator, None)
+            if chunk is None:
+                return 0
+            self._consumed += len(chunk)
+            if self._consumed > self._max_bytes:
+                raise OSError(f"archive exceeded {self._max_bytes} bytes")
+            self._buffer = chunk
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+_GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Validates/dumps the whole project list in pydantic-core instead of a
+# Python loop of per-field Project(**dict) constructions
+_PROJECT_LIST_ADAPTER = TypeAdapter(List[Project])
+
+# READMEs are stored zstd-compressed in projects.json (prose compresses
+# 5-10x), prefixed with this marker so plain-text files written by older
+# versions still load. Compressor/decompressor are stateless and shared.
+_ZSTD_MARKER = "zstd:"
+_ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=10)
+_ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+
+
+def _compress_readme(text: str) -> str:
+    if not text:
+        return text
+    compressed = _ZSTD_COMPRESSOR.compress(text.encode('utf-8'))
+    return _ZSTD_MARKER + base64.b64encode(compressed).decode('ascii')
+
+
+def _decompress_readme(stored: str) -> str:
+    if not stored or not stored.startswith(_ZSTD_MARKER):
+        return stored
+    compressed = base64.b64decode(stored[len(_ZSTD_MARKER):])
+    return _ZSTD_DECOMPRESSOR.decompress(compressed).decode('utf-8')
+
+# One page of this query replaces a REST listing call plus per-repo
+# metadata and README round trips: 100 repos with stars, forks, language,
+# timestamps and README text come back for a single rate-limit point.
+# Recursive file trees are not expressible in GraphQL, so those stay on
+# the REST tree endpoint.
+_REPOS_QUERY = """
+query($login: String!, $cursor: String) {
+  user(login: $login) {
+    repositories(first: 100, ownerAffiliations: OWNER, isFork: false, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        url
+        description
+        stargazerCount
+        forkCount
+        primaryLanguage { name }
+        createdAt
+        updatedAt
+        defaultBranchRef { name }
+        languages(first: 20) { edges { size node { name } } }
+        readmeMd: object(expression: "HEAD:README.md") { ... on Blob { text } }
+        readmeLowerMd: object(expression: "HEAD:readme.md") { ... on Blob { text } }
+        readmePlain: object(expression: "HEAD:README") { ... on Blob { text } }
+        readmeRst: object(expression: "HEAD:README.rst") { ... on Blob { text } }
+      }
+    }
+  }
+}
+"""
+
+_README_ALIASES = ("readmeMd", "readmeLowerMd", "readmePlain", "readmeRst")
+
+# Fallback technology extraction patterns, merged into one alternation and
+# compiled once at import instead of per call; a single finditer pass over
+# the README replaces a search-then-findall per category
+_TECH_PATTERNS = {
+    'python': r'\b(python|django|flask|fastapi|pandas|numpy|tensorflow|pytorch)\b',
+    'javascript': r'\b(javascript|node\.?js|react|vue|angular|express)\b',
+    'java': r'\b(java|spring|maven|gradle)\b',
+    'docker': r'\b(docker|dockerfile|container)\b',
+    'kubernetes': r'\b(kubernetes|k8s|helm)\b',
+    'aws': r'\b(aws|amazon web services|ec2|s3|lambda)\b',
+    'database': r'\b(mysql|postgresql|mongodb|redis|sqlite)\b',
+    'frontend': r'\b(html|css|scss|sass|bootstrap|tailwind)\b',
+    'api': r'\b(rest api|graphql|api)\b',
+    'testing': r'\b(pytest|jest|junit|testing|test)\b'
+}
+
+_TECH_RE = re.compile('|'.join(_TECH_PATTERNS.values()), re.IGNORECASE)
+
+# The same keyword set as _TECH_PATTERNS, flattened for Aho-Corasick: the
+# automaton (a C extension) matches every keyword simultaneously in one
+# linear pass over the README, where the regex alternation backtracks per
+# position. pyahocorasick is optional; the regex path stays as fallback.
+_TECH_KEYWORDS = (
+    'python', 'django', 'flask', 'fastapi', 'pandas', 'numpy', 'tensorflow', 'pytorch',
+    'javascript', 'nodejs', 'node.js', 'react', 'vue', 'angular', 'express',
+    'java', 'spring', 'maven', 'gradle',
+    'docker', 'dockerfile', 'container',
+    'kubernetes', 'k8s', 'helm',
+    'aws', 'amazon web services', 'ec2', 's3', 'lambda',
+    'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite',
+    'html', 'css', 'scss', 'sass', 'bootstrap', 'tailwind',
+    'rest api', 'graphql', 'api',
+    'pytest', 'jest', 'junit', 'testing', 'test',
+)
+
+if ahocorasick is not None:
+    _TECH_AUTOMATON = ahocorasick.Automaton()
+    for _kw in _TECH_KEYWORDS:
+        _TECH_AUTOMATON.add_word(_kw, _kw)
+    _TECH_AUTOMATON.make_automaton()
+else:
+    _TECH_AUTOMATON = None
+
+
+def _scan_tech_keywords(text: str) -> set:
+    """
+    Single Aho-Corasick pass over lowercased text. The automaton matches
+    raw substrings, so each hit is checked against word boundaries to keep
+    the \\b semantics of the regex path ('java' must not fire inside
+    'javascript' alternatives like 'rapid' firing 'api').
+    """
+    lowered = text.lower()
+    n = len(lowered)
+    found = set()
+    for end, keyword in _TECH_AUTOMATON.iter(lowered):
+        start = end - len(keyword) + 1
+        before = lowered[start - 1] if start > 0 else ' '
+        after = lowered[end + 1] if end + 1 < n else ' '
+        if (before.isalnum() or before == '_') or (after.isalnum() or after == '_'):
+            continue
+        found.add(keyword)
+    return found
+
+
+def _meaningful_lines(readme: str, n: int = 3) -> List[str]:
+    """
+    First n prose lines of a README: non-empty, not a header, image or
+    link line, and longer than 20 characters. Shared by the heuristic
+    summary fallbacks so the README is traversed (and each line stripped)
+    once instead of once per fallback. Iterating a StringIO yields lines
+    lazily, so the first few qualifying lines never force the whole
+    README into a line list.
+    """
+    out = []
+    for raw in io.StringIO(readme):
+        stripped = raw.strip()
+        if stripped and stripped[0] not in '#![' and len(stripped) > 20:
+            out.append(stripped)
+            if len(out) == n:
+                break
+    return out
+
+
+def _trim_readme(text: str, max_chars: int = 8192) -> str:
+    """
+    Head+tail slice for oversized READMEs: the intro carries the project
+    description and the tail carries install/usage sections, while the
+    middle is typically screenshots, badges and changelogs that only cost
+    regex time proportional to their length.
+    """
+    if len(text) <= max_chars:
+        return text
+    head = max_chars * 3 // 4
+    tail = max_chars - head
+    return text[:head] + "\n...\n" + text[-tail:]
+
+
+class _GraphQLRepo:
+    """Stand-in for a PyGithub Repository built from one GraphQL node.
+
+    Exposes the attributes _process_repository reads (name, html_url,
+    stargazers_count, ...) plus the README text already fetched by the bulk
+    query. Anything else — notably get_git_tree and get_contents — is
+    delegated to a lazy PyGithub Repository, which only costs a REST call
+    if it is actually used.
+    """
+
+    def __init__(self, node: dict, github: Github):
+        # The lazy REST handle must exist before __getattr__ can delegate
+        self._rest = github.get_repo(node["nameWithOwner"], lazy=True)
+        self.name = node["name"]
+        self.html_url = node["url"]
+        self.description = node["description"]
+        self.stargazers_count = node["stargazerCount"]
+        self.forks_count = node["forkCount"]
+        self.language = (node.get("primaryLanguage") or {}).get("name")
+        self.created_at = _parse_iso8601(node["createdAt"])
+        self.updated_at = _parse_iso8601(node["updatedAt"])
+        self.default_branch = (node.get("defaultBranchRef") or {}).get("name") or "main"
+        self.fork = False  # the query filters on isFork: false
+        self.readme_text = next(
+            (blob["text"] for alias in _README_ALIASES
+             if (blob := node.get(alias)) and blob.get("text")),
+            None
+        )
+        self.languages_map = {
+            edge["node"]["name"]: edge["size"]
+            for edge in (node.get("languages") or {}).get("edges", [])
+        }
+
+    def __getattr__(self, item):
+        return getattr(self._rest, item)
+
+
+def _parse_iso8601(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class _SemanticSummaryCache:
+    """Near-duplicate README cache for Gemini summary payloads.
+
+    Boilerplate READMEs (create-react-app, cookiecutter, classroom
+    templates) recur across repositories nearly verbatim; when a new
+    README embeds within cosine 0.95 of a previously summarized one, the
+    stored summary is reused instead of paying another Gemini call. Only
+    content fields (three_liner, detailed, technologies, bad_readme) are
+    reused — never suggested_name, which is repo-specific.
+    """
+
+    THRESHOLD = 0.95
+    TTL_SECONDS = 86400 * 7
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries "
+            "(id INTEGER PRIMARY KEY, vec BLOB, response TEXT, created REAL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def lookup(self, vec: np.ndarray) -> Optional[dict]:
+        cutoff = time.time() - self.TTL_SECONDS
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT vec, response FROM summaries WHERE created > ?", (cutoff,)
+            ).fetchall()
+        if not rows:
+            return None
+        # Vectors are L2-normalized, so cosine similarity is a dot product;
+        # the table stays small enough that brute force beats index upkeep
+        matrix = np.vstack([np.frombuffer(blob, dtype=np.float32) for blob, _ in rows])
+        sims = matrix @ vec
+        best = int(np.argmax(sims))
+        if sims[best] < self.THRESHOLD:
+            return None
+        payload = json.loads(rows[best][1])
+        payload["suggested_name"] = None
+        return payload
+
+    def insert(self, vec: np.ndarray, payload: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO summaries (vec, response, created) VALUES (?, ?, ?)",
+                (vec.astype(np.float32, copy=False).tobytes(), json.dumps(payload), time.time())
+            )
+            self._conn.commit()
+
+
+class _ETagCache:
+    """Persisted ETag/body pairs for conditional GitHub REST requests.
+
+    GitHub answers an If-None-Match revalidation with 304 and no body, and
+    304s do not count against the primary rate limit — so across scrape
+    runs, unchanged READMEs and file trees cost neither budget nor
+    transfer. The sidecar is a sqlite table next to projects.json, shared
+    by all scraper instances in the process: each 200 upserts only its own
+    row, so write cost stays flat no matter how many bodies have
+    accumulated, and startup does not parse every stored body.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS etags "
+            "(url TEXT PRIMARY KEY, etag TEXT, body TEXT)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, body FROM etags WHERE url = ?", (url,)
+            ).fetchone()
+
+    def set(self, url: str, etag: str, body: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO etags (url, etag, body) VALUES (?, ?, ?)",
+                (url, etag, body)
+            )
+            self._conn.commit()
+
 class GitHubScraper:
+    # How many repositories are processed concurrently during a scrape;
+    # bounded so GitHub and Gemini rate limits are not hammered all at once
+    _MAX_CONCURRENT_REPOS = 8
+
+    # One PyGithub client per token for the whole process. Each Github()
+    # builds its own requests.Session, so per-scraper instances were
+    # paying connection-pool and TLS setup for every WebSocket client.
+    _github_clients: dict = {}
+
+    @classmethod
+    def _get_github_client(cls, token: Optional[str]) -> Github:
+        key = token or ""
+        client = cls._github_clients.get(key)
+        if client is None:
+            kwargs = dict(per_page=100, retry=3, pool_size=20, timeout=15)
+            client = Github(token, **kwargs) if token else Github(**kwargs)
+            cls._github_clients[key] = client
+        return client
+
     def __init__(self, github_token: Optional[str] = None, websocket_manager=None, client_id: str = None):
         """
         Initialize GitHub scraper
@@ -22,46 +387,91 @@ class GitHubScraper:
             client_id: Client ID for WebSocket connection
         """
         self.github_token = github_token or os.getenv("GITHUB_TOKEN")
-        self.github = Github(self.github_token) if self.github_token else Github()
+        self.github = self._get_github_client(self.github_token)
         self._embedding_service = None
         self._gemini_service = None
         self.data_dir = "app/data"
         self.projects_file = os.path.join(self.data_dir, "projects.json")
         self.websocket_manager = websocket_manager
         self.client_id = client_id
+
+        # Coalescing progress queue, created lazily on the running loop
+        self._progress_queue = None
+        self._progress_flusher = None
         
-        # Thread pool for blocking operations
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        # Thread pool for blocking PyGithub calls; sized to the repo
+        # concurrency limit so parallel repos don't queue behind each other
+        self.executor = ThreadPoolExecutor(max_workers=self._MAX_CONCURRENT_REPOS)
         
         # Setup logger
         self.logger = get_scraper_logger()
-        
+
         # Create data directory if it doesn't exist
         os.makedirs(self.data_dir, exist_ok=True)
-        
+
+        # The HTTP client and sqlite sidecars are created lazily below:
+        # several routes construct a scraper just to call load_projects(),
+        # and those should not open a connection pool plus two sqlite
+        # handles per request (nor do they ever call cleanup())
+        self._http_client = None
+        self._etag_cache_db = None
+        self._summary_cache_db = None
+
         log_success(self.logger, "GitHubScraper initialized", f"client_id: {client_id}")
-    
+
     @property
     def embedding_service(self):
         """Lazy initialization of embedding service"""
         if self._embedding_service is None:
-            self._embedding_service = EmbeddingService()
+            self._embedding_service = get_embedding_service()
         return self._embedding_service
-    
+
     @property
     def gemini_service(self):
         """Lazy initialization of gemini service"""
         if self._gemini_service is None:
-            self._gemini_service = GeminiService()
+            self._gemini_service = get_gemini_service()
         return self._gemini_service
-    
-    def cleanup(self):
-        """Clean up resources"""
-        if hasattr(self, 'executor'):
-            self.executor.shutdown(wait=True)
-            log_success(self.logger, "Thread executor cleaned up", self.client_id or "unknown")
-    
-    async def send_progress(self, message: str, step: str, current: int = 0, total: int = 0, 
+
+    @property
+    def _http(self):
+        """
+        Lazy HTTP client shared by all REST calls, reusing connections
+        instead of a TLS handshake per request. HTTP/2 lets the concurrent
+        repo fetches multiplex over one TCP+TLS connection to api.github.com
+        """
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                http2=True,
+                timeout=30,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=20)
+            )
+        return self._http_client
+
+    @property
+    def _etag_cache(self):
+        """Lazy ETag sidecar so unchanged READMEs/trees revalidate as free 304s"""
+        if self._etag_cache_db is None:
+            self._etag_cache_db = _ETagCache(os.path.join(self.data_dir, "etag_cache.sqlite"))
+        return self._etag_cache_db
+
+    @property
+    def _summary_cache(self):
+        """
+        Lazy near-duplicate README cache so boilerplate-template repos
+        reuse a prior Gemini summary instead of a fresh call
+        """
+        if self._summary_cache_db is None:
+            self._summary_cache_db = _SemanticSummaryCache(os.path.join(self.data_dir, "gemini_cache.db"))
+        return self._summary_cache_db
+
+    # Progress frames are coalesced before hitting the socket: flush when
+    # this many are queued or this much time has passed, whichever first
+    _PROGRESS_FLUSH_MAX = 16
+    _PROGRESS_FLUSH_INTERVAL = 0.05
+
+    async def send_progress(self, message: str, step: str, current: int = 0, total: int = 0,
                           repo_name: str = "", alert_type: str = None, alert_message: str = ""):
         """Send progress update via WebSocket"""
         if self.websocket_manager and self.client_id:
@@ -78,16 +488,106 @@ class GitHubScraper:
                     "message": alert_message
                 } if alert_type else None
             }
-            await self.websocket_manager.send_progress(self.client_id, progress_data)
-    
+            await self._enqueue_progress(progress_data)
+
+    async def _enqueue_progress(self, progress_data: dict):
+        """
+        Queue a progress frame for the coalescing flusher, starting it
+        lazily on first use (so it binds to the running event loop)
+        """
+        if self._progress_queue is None:
+            self._progress_queue = asyncio.Queue()
+            self._progress_flusher = asyncio.create_task(self._flush_progress_loop())
+        await self._progress_queue.put(progress_data)
+
+    async def _flush_progress_loop(self):
+        """
+        Drain the progress queue in batches. With concurrent repo
+        processing each repo emits ~6 frames; sending them one per
+        WebSocket frame costs a syscall and JSON encode each, so bursts
+        are coalesced into a single progress_batch frame. A lone message
+        still goes out as a plain progress frame.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            items = [await self._progress_queue.get()]
+            deadline = loop.time() + self._PROGRESS_FLUSH_INTERVAL
+            while len(items) < self._PROGRESS_FLUSH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._progress_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            if len(items) == 1:
+                frame = items[0]
+            else:
+                frame = {"type": "progress_batch", "items": items}
+            try:
+                await self.websocket_manager.send_progress(self.client_id, frame)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A dropped client must not kill the flusher: frames keep
+                # draining (and may reach a reconnected socket) instead of
+                # piling up in the queue behind a dead task
+                log_warning(self.logger, f"Progress flush failed: {e}", self.client_id or "unknown")
+            finally:
+                for _ in items:
+                    self._progress_queue.task_done()
+
+    async def _drain_progress(self):
+        """
+        Wait until every queued progress frame has been flushed, so the
+        final completed/error frame is not dropped when cleanup() cancels
+        the flusher task right after the scrape returns
+        """
+        if self._progress_queue is not None:
+            await self._progress_queue.join()
+
     def _run_in_executor(self, func, *args):
         """Run a synchronous function in a thread pool"""
         loop = asyncio.get_event_loop()
         return loop.run_in_executor(self.executor, func, *args)
-    
-    async def scrape_and_process_repos(self, username: str) -> List[Project]:
+
+    async def _fetch_repos_graphql(self, username: str) -> Optional[List[_GraphQLRepo]]:
+        """
+        Fetch all owned non-fork repositories with metadata and README text
+        in pages of 100 via the GraphQL API. Returns None without a token
+        (GraphQL requires authentication), leaving the REST path to handle it.
+        """
+        if not self.github_token:
+            return None
+
+        nodes = []
+        headers = {"Authorization": f"bearer {self.github_token}"}
+        async with httpx.AsyncClient(http2=True, timeout=30) as client:
+            cursor = None
+            while True:
+                response = await client.post(
+                    _GITHUB_GRAPHQL_URL,
+                    json={"query": _REPOS_QUERY, "variables": {"login": username, "cursor": cursor}},
+                    headers=headers
+                )
+                response.raise_for_status()
+                payload = response.json()
+                if payload.get("errors"):
+                    raise RuntimeError(f"GraphQL query failed: {payload['errors']}")
+                repositories = payload["data"]["user"]["repositories"]
+                nodes.extend(repositories["nodes"])
+                if not repositories["pageInfo"]["hasNextPage"]:
+                    break
+                cursor = repositories["pageInfo"]["endCursor"]
+
+        return [_GraphQLRepo(node, self.github) for node in nodes]
+
+    async def scrape_and_process_repos(self, username: str, max_repos: Optional[int] = None) -> List[Project]:
         """
-        Scrape all repositories from a GitHub user and process them
+        Scrape all repositories from a GitHub user and process them.
+        max_repos optionally caps how many repositories are processed
+        (useful for quick test runs); by default the full set is scraped.
         """
         log_progress(self.logger, "Starting GitHub scrape", repo=username)
         
@@ -110,14 +610,28 @@ class GitHubScraper:
             log_progress(self.logger, "Fetching user repositories", step="API_CALL", repo=username)
             await self.send_progress("Fetching user repositories...", "fetching")
             
-            user = await self._run_in_executor(self.github.get_user, username)
-            repos_list = await self._run_in_executor(lambda: list(user.get_repos(type='owner')))
+            # One GraphQL query per 100 repos replaces the REST listing plus
+            # per-repo metadata and README calls; REST remains the fallback
+            # for tokenless runs or GraphQL outages
+            repos_list = None
+            try:
+                repos_list = await self._fetch_repos_graphql(username)
+            except Exception as e:
+                log_warning(self.logger, f"GraphQL repository fetch failed, falling back to REST: {e}", username)
+
+            if repos_list is None:
+                user = await self._run_in_executor(self.github.get_user, username)
+                repos_list = await self._run_in_executor(lambda: list(user.get_repos(type='owner')))
+
             # Filter out repos that are auto generated by GitHub (e.g., username.github.io)
             filtered_repos = [repo for repo in repos_list if not repo.name.startswith(username)]
-            
+
             # Filter out repos that are forks
             owned_repos = [repo for repo in filtered_repos if not repo.fork]
 
+            if max_repos is not None:
+                owned_repos = owned_repos[:max_repos]
+
             log_success(self.logger, f"Found {len(owned_repos)} repositories to process", username)
             await self.send_progress(
                 f"Found {len(owned_repos)} repositories to process", 
@@ -125,47 +639,80 @@ class GitHubScraper:
                 total=len(owned_repos)
             )
             
-            projects = []
             existing_projects = await self._run_in_executor(self.load_projects)
-            
+            # Dict lookup for the up-to-date check instead of a linear scan
+            # per repo over the whole project list
+            existing_updated = {p.name: p.updated_at for p in existing_projects}
+
             repos_to_process = owned_repos
-            
-            for i, repo in enumerate(repos_to_process, 1):
-                log_progress(self.logger, f"Processing repository: {repo.name} ({i}/{len(repos_to_process)})", repo=username)
-                await self.send_progress(
-                    f"Processing repository: {repo.name}", 
-                    "processing",
-                    current=i,
-                    total=len(repos_to_process),
-                    repo_name=repo.name
-                )
-                
+            total = len(repos_to_process)
+
+            # Repos are I/O-bound (GitHub API + Gemini), so they are
+            # processed concurrently with a semaphore keeping us inside the
+            # API rate limits instead of paying full round-trip latency per
+            # repo in a serial loop
+            semaphore = asyncio.Semaphore(self._MAX_CONCURRENT_REPOS)
+
+            async def process_one(i: int, repo) -> Optional[dict]:
                 # Check if repo is already processed and up-to-date
-                if any(p.name == repo.name and repo.updated_at <= p.updated_at for p in existing_projects):
+                previous_update = existing_updated.get(repo.name)
+                if previous_update is not None and repo.updated_at <= previous_update:
                     log_warning(self.logger, f"Repository {repo.name} is already up-to-date, skipping", username)
                     await self.send_progress(
-                        f"Repository {repo.name} is already up-to-date, skipping", 
+                        f"Repository {repo.name} is already up-to-date, skipping",
                         "skipping",
                         current=i,
-                        total=len(repos_to_process),
+                        total=total,
                         repo_name=repo.name,
                         alert_type="info",
                         alert_message=f"{repo.name} already processed"
                     )
-                    continue
+                    return None
+
+                async with semaphore:
+                    log_progress(self.logger, f"Processing repository: {repo.name} ({i}/{total})", repo=username)
+                    await self.send_progress(
+                        f"Processing repository: {repo.name}",
+                        "processing",
+                        current=i,
+                        total=total,
+                        repo_name=repo.name
+                    )
+                    return await self._fetch_repository_data(repo, i, total)
+
+            # gather preserves submission order, so repos stay in repo order
+            fetched = [d for d in await asyncio.gather(
+                *(process_one(i, repo) for i, repo in enumerate(repos_to_process, 1))
+            ) if d]
 
-                project = await self._process_repository(repo, i, len(repos_to_process))
+            # Repos whose summary wasn't served by the near-duplicate cache
+            # share batched Gemini calls, several repos per prompt
+            pending = [d for d in fetched if d["project"] is None and d["cached_summary"] is None]
+            if pending:
+                await self.send_progress(
+                    f"Generating AI summaries with Gemini for {len(pending)} repositories",
+                    "ai_processing",
+                    total=total
+                )
+                summaries = await self.gemini_service.generate_project_summaries_batch(
+                    [(d["repo"].name, d["readme_content"], d["tree"]) for d in pending]
+                )
+                for d, summary in zip(pending, summaries):
+                    d["cached_summary"] = summary
+                    if d["summary_vec"] is not None and summary:
+                        self._summary_cache.insert(d["summary_vec"], summary)
+
+            projects = []
+            for d in fetched:
+                project = d["project"] or await self._finalize_repository(d, d["cached_summary"] or {})
                 if project:
                     projects.append(project)
-                    log_success(self.logger, f"Successfully processed {repo.name}", username)
-                    
-                # Add a small delay between repositories to prevent overwhelming
-                await asyncio.sleep(0.5)
+                    log_success(self.logger, f"Successfully processed {project.name}", username)
 
             # Save projects to JSON file
             log_progress(self.logger, "Saving projects to database", step="SAVE", repo=username)
             await self.send_progress("Saving projects to database", "saving")
-            await self._run_in_executor(self._save_projects, projects)
+            await self._run_in_executor(self._save_projects, projects, existing_projects)
             
             # Generate embeddings for all projects
             log_progress(self.logger, "Generating embeddings for semantic search", step="EMBEDDINGS", repo=username)
@@ -186,32 +733,66 @@ class GitHubScraper:
         except Exception as e:
             log_error(self.logger, f"Error scraping GitHub profile: {str(e)}", username, exc_info=True)
             await self.send_progress(
-                f"Error scraping GitHub profile: {str(e)}", 
+                f"Error scraping GitHub profile: {str(e)}",
                 "error",
                 alert_type="error",
                 alert_message=str(e)
             )
             raise e
-    
-    async def _process_repository(self, repo: Repository, current: int, total: int) -> Optional[Project]:
+        finally:
+            await self._drain_progress()
+
+    async def _fetch_repository_data(self, repo: Repository, current: int, total: int,
+                                     no_cache: bool = False) -> Optional[dict]:
         """
-        Process a single repository and extract information
+        Fetch everything needed to summarize one repository: README, file
+        tree and (unless no_cache) a near-duplicate summary-cache lookup.
+        Returns a dict consumed by _finalize_repository; a repository
+        without a README comes back with its finished Project attached.
         """
         try:
             # Get README content
             await self.send_progress(
-                f"Reading README for {repo.name}", 
+                f"Reading README for {repo.name}",
                 "readme",
                 current=current,
                 total=total,
                 repo_name=repo.name
             )
-            
-            readme_content, success = await self._run_in_executor(self._get_readme_content, repo)
-            
+
+            # The GraphQL bulk fetch already carries the README text; repos
+            # without it (REST fallback, non-standard README names) get one
+            # tarball download that yields README and file tree together
+            # instead of the per-item contents + tree calls
+            prefetched_readme = getattr(repo, "readme_text", None)
+            # Independent REST fetch, so it runs concurrently with the
+            # README/tree work below instead of adding its own round trip
+            # when the technology fallback needs it later
+            languages_future = self._run_in_executor(self._get_repo_languages, repo)
+            tarball_tree = None
+            if prefetched_readme:
+                readme_content, success = prefetched_readme, True
+            else:
+                tarball = await self._run_in_executor(self._fetch_repo_tarball, repo)
+                if tarball is not None:
+                    tarball_readme, tarball_tree = tarball
+                    if tarball_readme is not None:
+                        readme_content, success = tarball_readme, True
+                    else:
+                        readme_content, success = "No README found", False
+                else:
+                    readme_content, success = await self._run_in_executor(self._get_readme_content, repo)
+
+            # One cap at ingest bounds every downstream cost — keyword scan,
+            # summary prompts, embedding text, stored JSON — for pathological
+            # READMEs; the head+tail slice keeps the intro and usage sections
+            # that all consumers actually read
+            if success:
+                readme_content = _trim_readme(readme_content, max_chars=65536)
+
             if not success:
                 await self.send_progress(
-                    f"Repository {repo.name} has no readable README", 
+                    f"Repository {repo.name} has no readable README",
                     "readme_missing",
                     current=current,
                     total=total,
@@ -219,8 +800,8 @@ class GitHubScraper:
                     alert_type="warning",
                     alert_message=f"No README found in {repo.name}"
                 )
-                
-                return Project(
+
+                project = Project(
                     name=repo.name,
                     suggested_name=None,  # No README means no way to extract suggested name
                     url=repo.html_url,
@@ -238,31 +819,72 @@ class GitHubScraper:
                     created_at=repo.created_at,
                     updated_at=repo.updated_at
                 )
-            
+                return {"repo": repo, "current": current, "total": total, "project": project}
+
             # Get repository file tree
             await self.send_progress(
-                f"Analyzing file structure for {repo.name}", 
+                f"Analyzing file structure for {repo.name}",
                 "file_tree",
                 current=current,
                 total=total,
                 repo_name=repo.name
             )
-            tree = await self._run_in_executor(self._get_repo_trees, repo)
-            
-            # Generate AI summaries
+            if tarball_tree is not None:
+                tree = tarball_tree
+            else:
+                tree = await self._run_in_executor(self._get_repo_trees, repo)
+            languages = await languages_future
+
+            # A README nearly identical to a previously summarized one
+            # (boilerplate templates) reuses that summary instead of a new
+            # Gemini call; the embedding also keys the insert on a miss
+            summary_vec = None
+            cached_summary = None
+            if not no_cache:
+                summary_vec = await self._run_in_executor(
+                    self._embed_summary_key, repo.name, readme_content
+                )
+                if summary_vec is not None:
+                    cached_summary = self._summary_cache.lookup(summary_vec)
+                    if cached_summary:
+                        log_progress(self.logger, f"Reusing near-duplicate summary for {repo.name}", repo=repo.name)
+
+            return {
+                "repo": repo,
+                "current": current,
+                "total": total,
+                "project": None,
+                "readme_content": readme_content,
+                "tree": tree,
+                "languages": languages,
+                "summary_vec": summary_vec,
+                "cached_summary": cached_summary,
+            }
+
+        except Exception as e:
             await self.send_progress(
-                f"Generating AI summary with Gemini for {repo.name}", 
-                "ai_processing",
+                f"Error processing repository {repo.name}: {str(e)}",
+                "error",
                 current=current,
                 total=total,
-                repo_name=repo.name
-            )
-            
-            gemini_response = await self._run_in_executor(
-                self.gemini_service.generate_project_summary, 
-                repo.name, readme_content, tree
+                repo_name=repo.name,
+                alert_type="error",
+                alert_message=f"Failed to process {repo.name}: {str(e)}"
             )
-            
+            return None
+
+    async def _finalize_repository(self, data: dict, gemini_response: dict) -> Optional[Project]:
+        """
+        Build the Project entry for a fetched repository from its Gemini
+        summary (batched, cached or fresh), filling any gaps with the
+        local heuristics.
+        """
+        repo = data["repo"]
+        current = data["current"]
+        total = data["total"]
+        readme_content = data["readme_content"]
+        tree = data["tree"]
+        try:
             three_liner = gemini_response.get("three_liner", "")
             detailed_paragraph = gemini_response.get("detailed", "")
             technologies = gemini_response.get("technologies", "")
@@ -284,14 +906,21 @@ class GitHubScraper:
                     alert_message=f"Poor README quality in {repo.name}"
                 )
             
-            if not three_liner:
-                three_liner = await self._run_in_executor(self._generate_three_liner, repo, readme_content)
-            if not detailed_paragraph:
-                detailed_paragraph = await self._run_in_executor(
-                    self._generate_detailed_paragraph, repo, readme_content, technologies
-                )
+            if not three_liner or not detailed_paragraph:
+                # Single README pass shared by both heuristic fallbacks
+                prose_lines = _meaningful_lines(readme_content)
+                if not three_liner:
+                    three_liner = await self._run_in_executor(
+                        self._generate_three_liner, repo, readme_content, prose_lines
+                    )
+                if not detailed_paragraph:
+                    detailed_paragraph = await self._run_in_executor(
+                        self._generate_detailed_paragraph, repo, readme_content, technologies, prose_lines
+                    )
             if not technologies:
-                technologies = await self._run_in_executor(self._extract_technologies, repo, readme_content)
+                technologies = await self._run_in_executor(
+                    self._extract_technologies, repo, readme_content, data.get("languages")
+                )
             
             await self.send_progress(
                 f"Creating project entry for {repo.name}", 
@@ -343,124 +972,239 @@ class GitHubScraper:
                 alert_message=f"Failed to process {repo.name}: {str(e)}"
             )
             return None
-    
+
+    async def _process_repository(self, repo: Repository, current: int, total: int,
+                                  no_cache: bool = False) -> Optional[Project]:
+        """
+        Process a single repository end-to-end. Used for single-repo
+        updates; the bulk scrape path fetches first and batches the Gemini
+        step across repositories instead.
+        no_cache skips the near-duplicate summary cache, forcing a fresh
+        Gemini summary for this repository.
+        """
+        data = await self._fetch_repository_data(repo, current, total, no_cache)
+        if data is None:
+            return None
+        if data["project"] is not None:
+            return data["project"]
+
+        gemini_response = data["cached_summary"]
+        if gemini_response is None:
+            await self.send_progress(
+                f"Generating AI summary with Gemini for {repo.name}",
+                "ai_processing",
+                current=current,
+                total=total,
+                repo_name=repo.name
+            )
+            gemini_response = await self.gemini_service.generate_project_summary_async(
+                repo.name, data["readme_content"], data["tree"]
+            )
+            if data["summary_vec"] is not None and gemini_response:
+                self._summary_cache.insert(data["summary_vec"], gemini_response)
+
+        return await self._finalize_repository(data, gemini_response or {})
+
+    def _conditional_get(self, url: str, accept: str = "application/vnd.github+json") -> str:
+        """
+        GET a GitHub REST URL with If-None-Match revalidation (synchronous -
+        run in executor). A 304 answer is served from the ETag sidecar
+        without re-downloading or re-spending rate-limit budget.
+        """
+        headers = {"Accept": accept}
+        if self.github_token:
+            headers["Authorization"] = f"Bearer {self.github_token}"
+
+        cached = self._etag_cache.get(url)
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
+        response = self._http.get(url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+        response.raise_for_status()
+
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache.set(url, etag, response.text)
+        return response.text
+
+    def _embed_summary_key(self, repo_name: str, readme_content: str) -> Optional[np.ndarray]:
+        """
+        Embed the semantic-cache key for a repository summary (synchronous -
+        run in executor). Returns None if the encoder is unavailable so the
+        caller falls through to a plain Gemini call.
+        """
+        try:
+            vec = self.embedding_service.model.encode(
+                [f"{repo_name}\n{readme_content[:4096]}"],
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )[0]
+            return vec.astype(np.float32, copy=False)
+        except Exception as e:
+            log_warning(self.logger, f"Could not embed summary cache key: {e}", repo_name)
+            return None
+
+    def _fetch_repo_tarball(self, repo) -> Optional[tuple[Optional[str], List[str]]]:
+        """
+        Download the repository tarball and pull both the README body and
+        the file-path listing out of it (synchronous - run in executor).
+        One streamed request replaces the README-contents probes plus the
+        recursive-tree call. Returns (readme_or_None, tree); None on any
+        failure so the caller falls back to the per-item REST endpoints.
+        """
+        headers = {}
+        if self.github_token:
+            headers["Authorization"] = f"Bearer {self.github_token}"
+
+        try:
+            with self._http.stream(
+                "GET",
+                f"https://api.github.com/repos/{repo.full_name}/tarball",
+                headers=headers
+            ) as response:
+                response.raise_for_status()
+
+                readme_content = None
+                file_paths = []
+                reader = _BoundedIterReader(response.iter_raw(), _TARBALL_MAX_BYTES)
+                # r|gz walks the archive as a forward-only stream: members
+                # are examined as their bytes arrive, so memory stays at
+                # one member regardless of archive size
+                with tarfile.open(fileobj=reader, mode="r|gz") as tar:
+                    for member in tar:
+                        if not member.isfile():
+                            continue
+                        # Members are prefixed with "<owner>-<repo>-<sha>/"
+                        path = member.name.split('/', 1)[1] if '/' in member.name else member.name
+                        file_paths.append(path)
+                        if readme_content is None and re.match(r"(?i)^readme(\.[a-z0-9]+)?$", path):
+                            extracted = tar.extractfile(member)
+                            if extracted is not None:
+                                readme_content = extracted.read().decode('utf-8', errors='replace')
+                        # Past the scan cap the kept subset is partial
+                        # either way (cf. the truncated-tree handling), so
+                        # once the README is in hand stop paying for bytes
+                        if readme_content is not None and len(file_paths) >= _TARBALL_SCAN_MAX:
+                            break
+
+            return readme_content, sorted(file_paths)[:_MAX_TREE_ENTRIES]
+
+        except Exception as e:
+            log_warning(self.logger, f"Tarball fetch failed: {e}", repo.full_name)
+            return None
+
     def _get_readme_content(self, repo) -> tuple[str, bool]:
         """
         Get README content from repository (synchronous - run in executor)
         """
         try:
-            # Try all common README file naming conventions
-            readme_files = self._get_readme_file_name(repo)
-            for readme_file in readme_files:
-                try:
-                    readme = repo.get_contents(readme_file)
-                    return readme.decoded_content.decode('utf-8'), True
-                except Exception:
-                    continue
-
-            return "No README found", False
+            # The dedicated /readme endpoint resolves naming and casing
+            # server-side, so one request covers every README convention
+            # instead of listing the root or probing variants
+            body = self._conditional_get(
+                f"https://api.github.com/repos/{repo.full_name}/readme",
+                accept="application/vnd.github.raw+json"
+            )
+            return body, True
 
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return "No README found", False
+            return "Error reading README", False
         except Exception:
             return "Error reading README", False
-    
+
     def _get_repo_trees(self, repo: Repository) -> List[str]:
         """
         Recursively get all files in the repository (synchronous - run in executor)
         """
-        try:
-            # First, try to get the default branch name
-            default_branch = repo.default_branch
-            tree = repo.get_git_tree(sha=default_branch, recursive=True).tree
-            file_paths = [item.path for item in tree if item.type == 'blob']
-            return file_paths
-            
-        except Exception as e:
-            print(f"Error with default branch '{default_branch}': {e}")
-            
-            # Fallback: try common branch names
-            common_branches = ['main', 'master']
-            
-            for branch in common_branches:
-                if branch == default_branch:
-                    continue  # Already tried this one
-                    
-                try:
-                    tree = repo.get_git_tree(sha=branch, recursive=True).tree
-                    file_paths = [item.path for item in tree if item.type == 'blob']
-                    return file_paths
-                    
-                except Exception as fallback_e:
-                    print(f"Failed with branch '{branch}': {fallback_e}")
-                    continue
-            
-            print("All attempts to get repository tree failed")
-            return []
+        default_branch = repo.default_branch
+        branches = [default_branch] + [b for b in ('main', 'master') if b != default_branch]
+
+        for branch in branches:
+            try:
+                body = self._conditional_get(
+                    f"https://api.github.com/repos/{repo.full_name}/git/trees/{branch}?recursive=1"
+                )
+                data = json.loads(body)
+                if data.get("truncated"):
+                    # GitHub truncates recursive listings past 100k entries /
+                    # 7 MB; the partial tree still far exceeds the
+                    # _MAX_TREE_ENTRIES cap, so it is used as-is
+                    log_warning(self.logger, "Tree listing truncated, using partial tree", repo.full_name)
+                file_paths = [item["path"] for item in data.get("tree", []) if item.get("type") == "blob"]
+                return sorted(file_paths)[:_MAX_TREE_ENTRIES]
+
+            except Exception as e:
+                log_warning(self.logger, f"Failed to get tree for branch '{branch}': {e}", repo.full_name)
+                continue
+
+        log_error(self.logger, "All attempts to get repository tree failed", repo.full_name)
+        return []
     
-    def _get_readme_file_name(self, repo: Repository) -> List[str]:
+    def _get_repo_languages(self, repo) -> dict:
         """
-        Get readme file name
+        Fetch the repository language byte counts (synchronous - run in
+        executor); empty dict on failure so callers can merge blindly.
+        Goes through the shared HTTP/2 client with ETag revalidation
+        rather than a fresh PyGithub/requests connection per call; repos
+        from the GraphQL bulk query already carry their language map and
+        skip the request entirely.
         """
+        prefetched = getattr(repo, "languages_map", None)
+        if prefetched is not None:
+            return prefetched
         try:
-            default_branch = repo.default_branch
-            tree = repo.get_git_tree(sha=default_branch, recursive=False).tree
-
-            candidates = [
-                item.path
-                for item in tree
-                if item.type == "blob"
-                and re.match(r"(?i)^readme(\.[a-z0-9]+)?$", item.path)
-            ]
-
-            if candidates:
-                return candidates
+            return json.loads(self._conditional_get(
+                f"https://api.github.com/repos/{repo.full_name}/languages"
+            ))
+        except Exception as e:
+            log_error(self.logger, f"Error getting languages: {str(e)}", repo.name)
+            return {}
 
-            return []
-        except Exception:
-            return [ "README.md", "README.MD", "readme.md", "Readme.md", "README",
-                "ReadMe", "readme", "readme.MD", "ReadMe.MD",
-            ]
-            
-    
-    def _extract_technologies(self, repo, readme_content: str) -> List[str]:
+    def _extract_technologies(self, repo, readme_content: str,
+                              languages: Optional[dict] = None) -> List[str]:
         """
         Extract technologies from repository language, README, and common files
         """
-        technologies = set()
-        
+        # Keyed by lowercase so "Python" (repo.language / languages API)
+        # and "python" (README scan) collapse to one entry; the first
+        # spelling seen is kept as the display value
+        canonical = {}
+
         # Add primary language
         if repo.language:
-            technologies.add(repo.language)
-        
-        # Extract from README content
-        tech_patterns = {
-            'python': r'\b(python|django|flask|fastapi|pandas|numpy|tensorflow|pytorch)\b',
-            'javascript': r'\b(javascript|node\.?js|react|vue|angular|express)\b',
-            'java': r'\b(java|spring|maven|gradle)\b',
-            'docker': r'\b(docker|dockerfile|container)\b',
-            'kubernetes': r'\b(kubernetes|k8s|helm)\b',
-            'aws': r'\b(aws|amazon web services|ec2|s3|lambda)\b',
-            'database': r'\b(mysql|postgresql|mongodb|redis|sqlite)\b',
-            'frontend': r'\b(html|css|scss|sass|bootstrap|tailwind)\b',
-            'api': r'\b(rest api|graphql|api)\b',
-            'testing': r'\b(pytest|jest|junit|testing|test)\b'
-        }
-        
-        readme_lower = readme_content.lower()
-        for tech_category, pattern in tech_patterns.items():
-            if re.search(pattern, readme_lower, re.IGNORECASE):
-                matches = re.findall(pattern, readme_lower, re.IGNORECASE)
-                technologies.update([match.strip() for match in matches])
-        
-        # Try to get languages from GitHub API
-        try:
-            languages = repo.get_languages()
-            technologies.update(languages.keys())
-        except Exception as e:
-            print(f"Error getting languages for repository {repo.name}: {str(e)}")
-            
-        return list(technologies)
+            canonical.setdefault(repo.language.lower(), repo.language)
+
+        # Use prefetched language stats when the caller has them; only
+        # direct calls (single-project updates) hit the API here
+        if languages is None:
+            languages = self._get_repo_languages(repo)
+        for name in languages:
+            canonical.setdefault(name.lower(), name)
+
+        # Extract from README content in one pass. Oversized READMEs are
+        # trimmed to head+tail first — technology mentions cluster in the
+        # intro and install sections. The Aho-Corasick automaton scans all
+        # keywords simultaneously when available; otherwise the combined
+        # regex alternation does the same work in pure Python.
+        trimmed = _trim_readme(readme_content)
+        if _TECH_AUTOMATON is not None:
+            scanned = _scan_tech_keywords(trimmed)
+        else:
+            scanned = {
+                match.group(0).lower().strip() for match in _TECH_RE.finditer(trimmed)
+            }
+        for keyword in scanned:
+            canonical.setdefault(keyword.lower(), keyword)
+
+        return list(canonical.values())
     
-    def _generate_three_liner(self, repo, readme_content: str) -> str:
+    def _generate_three_liner(self, repo, readme_content: str,
+                              meaningful_lines: Optional[List[str]] = None) -> str:
         """
         Generate a 3-line summary of the project
         """
@@ -468,13 +1212,11 @@ class GitHubScraper:
             # Simple heuristic-based summary for now
             # In production, you'd want to use a proper LLM here
             description = repo.description or "No description"
-            
+
             # Extract first meaningful paragraph from README
-            readme_lines = readme_content.split('\n')
-            meaningful_lines = [line.strip() for line in readme_lines 
-                              if line.strip() and not line.strip().startswith('#') 
-                              and len(line.strip()) > 20]
-            
+            if meaningful_lines is None:
+                meaningful_lines = _meaningful_lines(readme_content)
+
             first_paragraph = meaningful_lines[0] if meaningful_lines else description
             
             three_liner = f"• {repo.name}: {description}\n"
@@ -486,27 +1228,20 @@ class GitHubScraper:
         except Exception:
             return f"• {repo.name}: {repo.description or 'GitHub project'}\n• Technology project\n• See repository for details"
     
-    def _generate_detailed_paragraph(self, repo, readme_content: str, technologies: List[str]) -> str:
+    def _generate_detailed_paragraph(self, repo, readme_content: str, technologies: List[str],
+                                     meaningful_lines: Optional[List[str]] = None) -> str:
         """
         Generate a detailed paragraph about the project
         """
         try:
             description = repo.description or ""
             tech_str = ", ".join(technologies[:5]) if technologies else "various technologies"
-            
+
             # Extract meaningful content from README
-            readme_lines = readme_content.split('\n')
-            meaningful_content = []
-            
-            for line in readme_lines:
-                line = line.strip()
-                if (line and not line.startswith('#') and not line.startswith('![') 
-                    and not line.startswith('[') and len(line) > 20):
-                    meaningful_content.append(line)
-                    if len(meaningful_content) >= 3:
-                        break
-            
-            content_summary = " ".join(meaningful_content[:2]) if meaningful_content else description
+            if meaningful_lines is None:
+                meaningful_lines = _meaningful_lines(readme_content)
+
+            content_summary = " ".join(meaningful_lines[:2]) if meaningful_lines else description
             
             detailed = f"{repo.name} is a {repo.language or 'software'} project that {description.lower() if description else 'demonstrates technical expertise'}. "
             detailed += f"The project utilizes {tech_str} and showcases practical implementation skills. "
@@ -519,31 +1254,40 @@ class GitHubScraper:
         except Exception:
             return f"{repo.name} is a technical project demonstrating software development skills and practical implementation experience."
     
-    def _save_projects(self, projects: List[Project]):
+    def _save_projects(self, projects: List[Project], existing_projects: Optional[List[Project]] = None):
         """
-        Save projects to JSON file (synchronous - run in executor)
+        Save projects to JSON file (synchronous - run in executor).
+        Callers that already hold the loaded project list pass it in to
+        avoid a second parse of the same file.
         """
         try:
-            # Convert projects to dict format for JSON serialization
-            projects_data = []
-            existing_projects = self.load_projects()
+            if existing_projects is None:
+                existing_projects = self.load_projects()
             projects.extend(p for p in existing_projects if p.name not in {proj.name for proj in projects})
-            
-            for project in projects:
-                project_dict = project.dict()
-                # Convert datetime objects to ISO format strings
-                project_dict['created_at'] = project.created_at.isoformat()
-                project_dict['updated_at'] = project.updated_at.isoformat()
-                projects_data.append(project_dict)
-            
-            with open(self.projects_file, 'w', encoding='utf-8') as f:
-                f.write(json.dumps(projects_data, indent=2, ensure_ascii=False))
-                
-            print(f"Saved {len(projects)} projects to {self.projects_file}")
-            
+
+            self._write_projects_file(projects)
+
         except Exception as e:
-            print(f"Error saving projects: {str(e)}")
-    
+            log_error(self.logger, f"Error saving projects: {str(e)}")
+
+    def _write_projects_file(self, projects: List[Project]):
+        """
+        Serialize projects to projects.json with orjson, which writes
+        datetimes natively — no per-project isoformat conversions — and
+        produces bytes, hence the binary mode. Written to a sidecar file
+        first and swapped in with os.replace so a crash mid-write never
+        leaves a truncated projects.json behind.
+        """
+        projects_data = _PROJECT_LIST_ADAPTER.dump_python(projects)
+        for project_dict in projects_data:
+            project_dict['readme_content'] = _compress_readme(project_dict.get('readme_content') or "")
+        tmp_file = self.projects_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(projects_data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, self.projects_file)
+
+        log_success(self.logger, f"Saved {len(projects)} projects to {self.projects_file}")
+
     def load_projects(self) -> List[Project]:
         """
         Load projects from JSON file (synchronous - run in executor)
@@ -551,46 +1295,30 @@ class GitHubScraper:
         try:
             if not os.path.exists(self.projects_file):
                 return []
-                
-            with open(self.projects_file, 'r', encoding='utf-8') as f:
-                file_content = f.read()
-                projects_data = json.loads(file_content)
-            
-            projects = []
+
+            with open(self.projects_file, 'rb') as f:
+                projects_data = orjson.loads(f.read())
+
             for project_dict in projects_data:
-                # Convert ISO format strings back to datetime objects
-                project_dict['created_at'] = datetime.fromisoformat(project_dict['created_at'])
-                project_dict['updated_at'] = datetime.fromisoformat(project_dict['updated_at'])
-                projects.append(Project(**project_dict))
-            
-            return projects
-            
+                project_dict['readme_content'] = _decompress_readme(project_dict.get('readme_content') or "")
+
+            # pydantic-core validates the whole list (including ISO datetime
+            # parsing) in one Rust call instead of per-Project constructors
+            return _PROJECT_LIST_ADAPTER.validate_python(projects_data)
+
         except Exception as e:
-            print(f"Error loading projects: {str(e)}")
+            log_error(self.logger, f"Error loading projects: {str(e)}")
             return []
-    
+
     def save_projects(self, projects: List[Project]):
         """
         Public method to save projects to JSON file
         """
         try:
-            # Convert projects to dict format for JSON serialization
-            projects_data = []
-            
-            for project in projects:
-                project_dict = project.dict()
-                # Convert datetime objects to ISO format strings
-                project_dict['created_at'] = project.created_at.isoformat()
-                project_dict['updated_at'] = project.updated_at.isoformat()
-                projects_data.append(project_dict)
-            
-            with open(self.projects_file, 'w', encoding='utf-8') as f:
-                f.write(json.dumps(projects_data, indent=2, ensure_ascii=False))
-                
-            print(f"Saved {len(projects)} projects to {self.projects_file}")
-            
+            self._write_projects_file(projects)
+
         except Exception as e:
-            print(f"Error saving projects: {str(e)}")
+            log_error(self.logger, f"Error saving projects: {str(e)}")
             raise e
     
     async def update_single_project(self, github_username: str, repo_name: str):
@@ -626,7 +1354,7 @@ class GitHubScraper:
                 self.save_projects(existing_projects)
                 
                 # Refresh embeddings for all projects
-                embedding_service = EmbeddingService()
+                embedding_service = get_embedding_service()
                 embedding_service.generate_embeddings_for_projects(existing_projects)
                 
                 log_success(self.logger, f"Successfully updated project {repo_name}", repo_name)
@@ -639,5 +1367,11 @@ class GitHubScraper:
     
     def cleanup(self):
         """Clean up resources"""
+        if self._progress_flusher is not None:
+            self._progress_flusher.cancel()
+            self._progress_flusher = None
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
         if hasattr(self, 'executor'):
             self.executor.shutdown(wait=False)
\ No newline at end of file
@@ -4,7 +4,7 @@ import subprocess
 import shutil
 import PyPDF2
 from app.models.project import CoverLetterRequest
-from app.services.gemini_service import GeminiService
+from app.services.gemini_service import get_gemini_service
 
 class CoverLetterGenerator:
     def __init__(self):
@@ -18,48 +18,29 @@ class CoverLetterGenerator:
         os.makedirs(self.templates_dir, exist_ok=True)
         
         # Initialize Gemini service
-        self.gemini_service = GeminiService()
+        self.gemini_service = get_gemini_service()
     
     def generate_cover_letter(self, request: CoverLetterRequest) -> str:
         """
         Generate cover letter PDF using Gemini AI
         """
         try:
-            # Use a default professional template if no template PDF exists
-            template_path = request.template_path or os.path.join(self.templates_dir, "cover_letter_template.pdf")
-            
-            if os.path.exists(template_path):
-                template_text = self._extract_text_from_pdf(template_path)
-            else:
-                # Default professional template structure
-                template_text = """
-                Dear Hiring Manager,
-
-                I am writing to express my strong interest in the [Position] role at [Company]. With my background in software development and proven track record in delivering high-quality projects, I am confident I would be a valuable addition to your team.
-
-                In my recent projects, I have gained extensive experience with [relevant technologies]. My work has focused on [relevant domains], where I have successfully [achievements]. This experience has equipped me with the technical skills and problem-solving abilities that align perfectly with your requirements.
+            template_text = self._resolve_template_text(request.template_path)
 
-                What particularly excites me about this opportunity is [company/role specific interest]. I am eager to contribute my expertise to help [Company] achieve its goals and would welcome the opportunity to discuss how my background can benefit your team.
-
-                Thank you for your time and consideration.
-
-                Best regards,
-                [Your Name]
-                """
             # Generate cover letter content using Gemini
             cover_letter_content, company = self.gemini_service.generate_cover_letter(
                 template_text=template_text,
                 job_description=request.job_description,
                 projects=request.matched_projects,
             )
-            
+
             print("Generated Cover Letter for:\n", company)
-            
+
             # Create LaTeX content with the generated text
-            
+
             latex_content = self._create_latex_document(cover_letter_content, personal_info=request.personal_info)
             print("Generated LaTeX content for cover letter.")
-            
+
             # Generate PDF
             pdf_path = self._compile_latex(latex_content, f"cover_letter_{company}")
             return pdf_path
@@ -67,6 +48,60 @@ class CoverLetterGenerator:
         except Exception as e:
             raise RuntimeError(f"Error generating cover letter: {str(e)}")
 
+    def generate_cover_letter_with_analysis(self, request: CoverLetterRequest) -> tuple[str, dict]:
+        """
+        Generate the cover letter PDF and the job analysis from raw job
+        text in a single combined Gemini call, instead of one call to
+        parse the job and a second one to write the letter.
+        Returns (pdf_path, job_analysis).
+        """
+        try:
+            template_text = self._resolve_template_text(request.template_path)
+
+            job_analysis, cover_letter_content, company = self.gemini_service.parse_and_write(
+                job_description=request.job_description,
+                template_text=template_text,
+                projects=request.matched_projects,
+            )
+
+            print("Generated Cover Letter for:\n", company)
+
+            latex_content = self._create_latex_document(cover_letter_content, personal_info=request.personal_info)
+            print("Generated LaTeX content for cover letter.")
+
+            pdf_path = self._compile_latex(latex_content, f"cover_letter_{company}")
+            return pdf_path, job_analysis
+
+        except Exception as e:
+            raise RuntimeError(f"Error generating cover letter: {str(e)}")
+
+    def _resolve_template_text(self, template_path: str) -> str:
+        """
+        Extract the template text from the given (or default) PDF, falling
+        back to the built-in professional template structure
+        """
+        # Use a default professional template if no template PDF exists
+        template_path = template_path or os.path.join(self.templates_dir, "cover_letter_template.pdf")
+
+        if os.path.exists(template_path):
+            return self._extract_text_from_pdf(template_path)
+
+        # Default professional template structure
+        return """
+        Dear Hiring Manager,
+
+        I am writing to express my strong interest in the [Position] role at [Company]. With my background in software development and proven track record in delivering high-quality projects, I am confident I would be a valuable addition to your team.
+
+        In my recent projects, I have gained extensive experience with [relevant technologies]. My work has focused on [relevant domains], where I have successfully [achievements]. This experience has equipped me with the technical skills and problem-solving abilities that align perfectly with your requirements.
+
+        What particularly excites me about this opportunity is [company/role specific interest]. I am eager to contribute my expertise to help [Company] achieve its goals and would welcome the opportunity to discuss how my background can benefit your team.
+
+        Thank you for your time and consideration.
+
+        Best regards,
+        [Your Name]
+        """
+
     def _extract_text_from_pdf(self, pdf_path: str) -> str:
         """
         Extract text content from PDF template
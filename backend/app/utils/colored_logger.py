@@ -2,6 +2,8 @@
 Colored logger utility for better backend logging with timestamps and colors
 """
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 import colorama
 from colorama import Fore, Back, Style
 from datetime import datetime
@@ -10,6 +12,9 @@ import sys
 # Initialize colorama for cross-platform colored output
 colorama.init(autoreset=True)
 
+# Keep QueueListeners alive for the life of the process; one per logger
+_QUEUE_LISTENERS = []
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter to add colors and better timestamps to log messages"""
     
@@ -73,10 +78,16 @@ def setup_colored_logger(name: str, level: int = logging.INFO) -> logging.Logger
     # Create and set the colored formatter
     formatter = ColoredFormatter()
     console_handler.setFormatter(formatter)
-    
-    # Add handler to logger
-    logger.addHandler(console_handler)
-    
+
+    # Log records go through an in-memory queue drained by a background
+    # thread, so concurrent scrape workers never block on stdout writes
+    queue = SimpleQueue()
+    listener = QueueListener(queue, console_handler, respect_handler_level=True)
+    listener.start()
+    _QUEUE_LISTENERS.append(listener)
+
+    logger.addHandler(QueueHandler(queue))
+
     return logger
 
 def get_websocket_logger() -> logging.Logger:
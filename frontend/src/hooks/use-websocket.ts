@@ -15,6 +15,12 @@ export interface ProgressMessage {
   };
 }
 
+// Backend coalesces bursts of progress messages into one frame
+export interface ProgressBatchMessage {
+  type: "progress_batch";
+  items: ProgressMessage[];
+}
+
 export interface ProgressState {
   isConnected: boolean;
   currentMessage: string;
@@ -63,36 +69,43 @@ export const useProgressWebSocket = (url: string) => {
 
       wsRef.current.onmessage = (event) => {
         try {
-          const data: ProgressMessage = JSON.parse(event.data);
+          const data: ProgressMessage | ProgressBatchMessage = JSON.parse(
+            event.data
+          );
+          const items =
+            data.type === "progress_batch" ? data.items : [data];
 
           setState((prev) => {
-            const newHistory = [...prev.history, data];
+            const newHistory = [...prev.history, ...items];
+            const latest = items[items.length - 1];
             const progress =
-              data.total > 0
-                ? (data.current / data.total) * 100
+              latest.total > 0
+                ? (latest.current / latest.total) * 100
                 : prev.progress;
 
             const newAlerts = [...prev.alerts];
-            if (data.alert) {
-              newAlerts.push({
-                id: `${Date.now()}-${Math.random()}`,
-                type: data.alert.type,
-                message: data.alert.message,
-                timestamp: data.timestamp,
-              });
-
-              // Keep only last 10 alerts
-              if (newAlerts.length > 10) {
-                newAlerts.splice(0, newAlerts.length - 10);
+            for (const item of items) {
+              if (item.alert) {
+                newAlerts.push({
+                  id: `${Date.now()}-${Math.random()}`,
+                  type: item.alert.type,
+                  message: item.alert.message,
+                  timestamp: item.timestamp,
+                });
               }
             }
 
+            // Keep only last 10 alerts
+            if (newAlerts.length > 10) {
+              newAlerts.splice(0, newAlerts.length - 10);
+            }
+
             return {
               ...prev,
-              currentMessage: data.message,
-              currentStep: data.step,
+              currentMessage: latest.message,
+              currentStep: latest.step,
               progress,
-              currentRepo: data.repo_name,
+              currentRepo: latest.repo_name,
               history: newHistory.slice(-50), // Keep last 50 messages
               alerts: newAlerts,
             };
@@ -53,7 +53,7 @@ class TestWebSocketEndpoints:
     @pytest.mark.asyncio
     async def test_analyze_job_without_websocket(self):
         """Test job analysis without websocket (no client_id)"""
-        # Mock the GeminiService
+        # Mock the Gemini service factory
         mock_analysis = {
             "title": "Software Engineer",
             "company": "Test Company",
@@ -63,10 +63,10 @@ class TestWebSocketEndpoints:
             "analysis_summary": "Test job analysis"
         }
         
-        with patch('app.routes.jobs.GeminiService') as mock_gemini_class:
+        with patch('app.routes.jobs.get_gemini_service') as mock_get_gemini:
             mock_gemini_instance = Mock()
             mock_gemini_instance.job_description_parser.return_value = mock_analysis
-            mock_gemini_class.return_value = mock_gemini_instance
+            mock_get_gemini.return_value = mock_gemini_instance
             
             job_desc = JobDescription(description="Test job description")
             result = await analyze_job_description(job_desc)
@@ -77,18 +77,18 @@ class TestWebSocketEndpoints:
     @pytest.mark.asyncio 
     async def test_analyze_job_with_websocket(self):
         """Test job analysis with websocket updates"""
-        # Mock the GeminiService
+        # Mock the Gemini service factory
         mock_analysis = {
             "title": "Software Engineer",
             "required_technologies": ["Python", "JavaScript"]
         }
         
-        with patch('app.routes.jobs.GeminiService') as mock_gemini_class, \
+        with patch('app.routes.jobs.get_gemini_service') as mock_get_gemini, \
              patch('app.routes.jobs.websocket_manager', self.mock_websocket_manager):
-            
+
             mock_gemini_instance = Mock()
             mock_gemini_instance.job_description_parser.return_value = mock_analysis
-            mock_gemini_class.return_value = mock_gemini_instance
+            mock_get_gemini.return_value = mock_gemini_instance
             
             job_desc = JobDescription(description="Test job description", client_id="test-123")
             result = await analyze_job_description(job_desc)
@@ -101,12 +101,12 @@ class TestWebSocketEndpoints:
     @pytest.mark.asyncio
     async def test_analyze_job_error_handling(self):
         """Test job analysis error handling with websocket"""
-        with patch('app.routes.jobs.GeminiService') as mock_gemini_class, \
+        with patch('app.routes.jobs.get_gemini_service') as mock_get_gemini, \
              patch('app.routes.jobs.websocket_manager', self.mock_websocket_manager):
-            
+
             mock_gemini_instance = Mock()
             mock_gemini_instance.job_description_parser.side_effect = Exception("Gemini error")
-            mock_gemini_class.return_value = mock_gemini_instance
+            mock_get_gemini.return_value = mock_gemini_instance
             
             job_desc = JobDescription(description="Test job description", client_id="test-123")
             
@@ -124,12 +124,12 @@ class TestWebSocketEndpoints:
             Mock(project=Mock(name="Project2"), similarity_score=0.7)
         ]
         
-        with patch('app.routes.jobs.EmbeddingService') as mock_embedding_class, \
+        with patch('app.routes.jobs.get_embedding_service') as mock_get_embedding, \
              patch('app.routes.jobs.websocket_manager', self.mock_websocket_manager):
-            
+
             mock_embedding_instance = Mock()
             mock_embedding_instance.find_matching_projects.return_value = mock_projects
-            mock_embedding_class.return_value = mock_embedding_instance
+            mock_get_embedding.return_value = mock_embedding_instance
             
             job_desc_input = JobDescriptionInput(
                 job_description={"title": "Software Engineer", "description": "Test description"},